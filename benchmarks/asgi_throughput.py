@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from fastapi import FastAPI
+
+from benchmarks.asgi import request
+from benchmarks.runner import BenchmarkResult, collect
+from src.bootstrap import create_app
+from src.core.config import settings
+
+
+def build_app(log_requests: bool, log_directory: Path) -> FastAPI:
+    settings.fastapi.log_requests = log_requests
+    settings.requests_log.directory = log_directory
+    return create_app()
+
+
+async def run(
+    iterations: int, concurrency: int, log_directory: Path
+) -> list[BenchmarkResult]:
+    """
+    Requests per second of the full `create_app()` stack (middlewares and
+    routing) on an endpoint that doesn't touch the database, with and
+    without RequestsLogMiddleware.
+    """
+    results: list[BenchmarkResult] = []
+    log_requests, directory = (
+        settings.fastapi.log_requests,
+        settings.requests_log.directory,
+    )
+    try:
+        for label, enabled in (("with_requests_log", True), ("no_requests_log", False)):
+            app = build_app(enabled, log_directory)
+
+            async def get_status(app: FastAPI = app) -> None:
+                status_code, body = await request(
+                    app, "GET", "/api/v1/healthcheck/status"
+                )
+                assert status_code == 200, body
+
+            async def post_status(app: FastAPI = app) -> None:
+                # A body for the log middleware to capture; answered with 405
+                await request(
+                    app,
+                    "POST",
+                    "/api/v1/healthcheck/status",
+                    body=b'{"payload": "' + b"x" * 1024 + b'"}',
+                    headers=[(b"content-type", b"application/json")],
+                )
+
+            await collect(
+                results,
+                f"asgi.get[{label}]",
+                get_status,
+                iterations,
+                concurrency=concurrency,
+            )
+            await collect(
+                results,
+                f"asgi.post_body[{label}]",
+                post_status,
+                iterations,
+                concurrency=concurrency,
+            )
+    finally:
+        settings.fastapi.log_requests = log_requests
+        settings.requests_log.directory = directory
+
+    return results
@@ -0,0 +1,58 @@
+from datetime import datetime
+from uuid import UUID
+
+import sqlalchemy as sa
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.pagination import SQLAlchemyModelPaginator
+from src.core.repositories.sqla.base_repository import BaseSQLAlchemyRepositoryImpl
+from src.core.schemas import UpdateBaseModel
+from src.db.base import Base
+
+
+class BenchmarkItem(Base):
+    # Created and dropped by every benchmark run
+    __tablename__ = "benchmark_items"
+
+    name: Mapped[str] = mapped_column(sa.String(100))
+    description: Mapped[str | None] = mapped_column(sa.Text)
+    value: Mapped[int]
+
+
+class BenchmarkItemReadSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    id: UUID
+    name: str
+    description: str | None
+    value: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class BenchmarkItemCreateSchema(BaseModel):
+    name: str
+    description: str | None = None
+    value: int
+
+
+class BenchmarkItemUpdateSchema(UpdateBaseModel):
+    name: str | None = None
+    value: int | None = None
+
+
+class BenchmarkItemRepository(
+    BaseSQLAlchemyRepositoryImpl[
+        BenchmarkItem,
+        BenchmarkItemReadSchema,
+        BenchmarkItemCreateSchema,
+        BenchmarkItemUpdateSchema,
+    ]
+):
+    model_type = BenchmarkItem
+    read_schema_type = BenchmarkItemReadSchema
+
+
+class BenchmarkItemPaginator(SQLAlchemyModelPaginator[BenchmarkItemReadSchema]):
+    pagination_item_type = BenchmarkItemReadSchema
@@ -0,0 +1,146 @@
+import itertools
+import random
+from typing import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from uuid import UUID
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from benchmarks.models import (
+    BenchmarkItem,
+    BenchmarkItemCreateSchema,
+    BenchmarkItemPaginator,
+    BenchmarkItemRepository,
+    BenchmarkItemUpdateSchema,
+)
+from benchmarks.runner import BenchmarkResult, collect
+from src.core.schemas import PaginationSchema
+
+
+@asynccontextmanager
+async def benchmark_table(dsn: str) -> AsyncIterator[AsyncEngine]:
+    """
+    Engine with a fresh `benchmark_items` table, dropped on exit.
+    """
+    engine = create_async_engine(dsn)
+    table = BenchmarkItem.__table__
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(table.drop, checkfirst=True)  # type: ignore[attr-defined]
+            await conn.run_sync(table.create)  # type: ignore[attr-defined]
+
+        yield engine
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(table.drop, checkfirst=True)  # type: ignore[attr-defined]
+        await engine.dispose()
+
+
+def create_schemas(count: int, prefix: str = "item") -> list[BenchmarkItemCreateSchema]:
+    return [
+        BenchmarkItemCreateSchema(
+            name=f"{prefix} {i}", description="lorem ipsum dolor sit amet", value=i
+        )
+        for i in range(count)
+    ]
+
+
+async def run(
+    dsn: str,
+    rows: int,
+    sizes: list[int],
+    iterations: int,
+) -> list[BenchmarkResult]:
+    """
+    Seeds `rows` rows, then times the repository methods with batches of
+    `sizes` rows and the paginator on its first and last page.
+    """
+    results: list[BenchmarkResult] = []
+
+    async with benchmark_table(dsn) as engine:
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with session_factory() as session:
+            # Seeded without the repository, so that any dialect can be used
+            await session.execute(
+                sa.insert(BenchmarkItem),
+                [item.model_dump() for item in create_schemas(rows)],
+            )
+            await session.commit()
+        async with session_factory() as session:
+            ids: list[UUID] = list(
+                (await session.execute(sa.select(BenchmarkItem.id))).scalars()
+            )
+
+        async def get() -> None:
+            async with session_factory() as session:
+                await BenchmarkItemRepository(session).get(random.choice(ids))
+
+        await collect(results, "repository.get", get, iterations)
+
+        for size in sizes:
+
+            async def get_by_ids(size: int = size) -> None:
+                async with session_factory() as session:
+                    await BenchmarkItemRepository(session).get_by_ids(
+                        random.sample(ids, size)
+                    )
+
+            await collect(
+                results, f"repository.get_by_ids[{size}]", get_by_ids, iterations
+            )
+
+        for size in sizes:
+            batches = iter(
+                [create_schemas(size, prefix=f"new {i}") for i in range(iterations + 3)]
+            )
+
+            async def bulk_create(
+                batches: Iterator[list[BenchmarkItemCreateSchema]] = batches,
+            ) -> None:
+                async with session_factory() as session:
+                    await BenchmarkItemRepository(session).bulk_create(next(batches))
+
+            await collect(
+                results, f"repository.bulk_create[{size}]", bulk_create, iterations
+            )
+
+        for size in sizes:
+            counter = itertools.count()
+
+            async def bulk_update(
+                size: int = size, counter: Iterator[int] = counter
+            ) -> None:
+                value = next(counter)
+                async with session_factory() as session:
+                    await BenchmarkItemRepository(session).bulk_update(
+                        [
+                            BenchmarkItemUpdateSchema(id=id, value=value)
+                            for id in random.sample(ids, size)
+                        ]
+                    )
+
+            await collect(
+                results, f"repository.bulk_update[{size}]", bulk_update, iterations
+            )
+
+        page_size = 50
+        async with session_factory() as session:
+            total = (
+                await session.execute(sa.select(sa.func.count(BenchmarkItem.id)))
+            ).scalar_one()
+        last_page = max((total + page_size - 1) // page_size, 1)
+
+        for label, page in (("first", 1), ("last", last_page)):
+
+            async def get_list(page: int = page) -> None:
+                async with session_factory() as session:
+                    await BenchmarkItemRepository(session).get_all_paginated(
+                        PaginationSchema(page=page, page_size=page_size),
+                        BenchmarkItemPaginator,
+                    )
+
+            await collect(results, f"paginator.get_list[{label}]", get_list, iterations)
+
+    return results
@@ -0,0 +1,118 @@
+"""
+Serialization cost of a 10k item page: FastAPI's default response path
+(dump to dict, validate against the response model, serialize, json.dumps)
+against PydanticJSONRoute + PydanticJSONResponse.
+
+    python -m benchmarks.response_encoding [--items 10000] [--requests 50]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from fastapi import APIRouter, FastAPI
+from pydantic import BaseModel
+
+from benchmarks.asgi import request
+from src.core.responses import PydanticJSONResponse
+from src.core.routing import PydanticJSONRoute
+from src.core.schemas import PaginatedResponseSchema
+
+
+class Item(BaseModel):
+    id: UUID
+    name: str
+    description: str | None
+    price: float
+    quantity: int
+    created_at: datetime
+    updated_at: datetime
+
+
+def make_page(size: int) -> PaginatedResponseSchema[Item]:
+    now = datetime.now(timezone.utc)
+    return PaginatedResponseSchema[Item](
+        page=1,
+        page_size=size,
+        total_pages=1,
+        total_items=size,
+        items=[
+            Item(
+                id=uuid4(),
+                name=f"item {i}",
+                description="lorem ipsum dolor sit amet" if i % 2 else None,
+                price=i * 1.5,
+                quantity=i,
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(size)
+        ],
+    )
+
+
+def make_app(page: PaginatedResponseSchema[Item], fast: bool) -> FastAPI:
+    router = (
+        APIRouter(
+            route_class=PydanticJSONRoute,
+            default_response_class=PydanticJSONResponse,
+        )
+        if fast
+        else APIRouter()
+    )
+
+    @router.get("/items", response_model=PaginatedResponseSchema[Item])
+    async def get_items() -> PaginatedResponseSchema[Item]:
+        return page
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> list[float]:
+    status_code, body = await request(app, "GET", "/items")
+    assert status_code == 200, body
+
+    timings = []
+    for _ in range(requests):
+        started_at = time.perf_counter()
+        await request(app, "GET", "/items")
+        timings.append(time.perf_counter() - started_at)
+
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    page = make_page(args.items)
+    default_app, fast_app = make_app(page, fast=False), make_app(page, fast=True)
+
+    _, default_body = await request(default_app, "GET", "/items")
+    _, fast_body = await request(fast_app, "GET", "/items")
+    assert PaginatedResponseSchema[Item].model_validate_json(
+        default_body
+    ) == PaginatedResponseSchema[Item].model_validate_json(fast_body)
+
+    print(f"{args.items} items, {args.requests} requests, {len(fast_body)} bytes")
+    results = {}
+    for name, app in (("default", default_app), ("pydantic_json", fast_app)):
+        timings = await measure(app, args.requests)
+        results[name] = statistics.median(timings)
+        print(
+            f"{name:>14}: median {results[name] * 1000:8.2f} ms"
+            f"  p99 {statistics.quantiles(timings, n=100)[98] * 1000:8.2f} ms"
+        )
+
+    print(f"speedup: {results['default'] / results['pydantic_json']:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
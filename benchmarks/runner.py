@@ -0,0 +1,121 @@
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int
+    # Seconds per call
+    p50: float
+    p99: float
+    ops_per_sec: float
+
+
+async def measure(
+    name: str,
+    call: Callable[[], Awaitable[Any]],
+    iterations: int,
+    warmup: int = 3,
+    concurrency: int = 1,
+) -> BenchmarkResult:
+    """
+    Times `iterations` calls of `call`, run by `concurrency` concurrent
+    workers, after `warmup` untimed calls. Throughput is measured over the
+    whole run, so with concurrency it's higher than `1 / p50`.
+    """
+    for _ in range(warmup):
+        await call()
+
+    timings: list[float] = []
+
+    async def worker(calls: int) -> None:
+        for _ in range(calls):
+            started_at = time.perf_counter()
+            await call()
+            timings.append(time.perf_counter() - started_at)
+
+    per_worker, rest = divmod(iterations, concurrency)
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker(per_worker + (i < rest)) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    return BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        p50=statistics.median(timings),
+        p99=(
+            statistics.quantiles(timings, n=100, method="inclusive")[98]
+            if len(timings) > 1
+            else timings[0]
+        ),
+        ops_per_sec=iterations / elapsed,
+    )
+
+
+async def collect(
+    results: list[BenchmarkResult],
+    name: str,
+    call: Callable[[], Awaitable[Any]],
+    iterations: int,
+    warmup: int = 3,
+    concurrency: int = 1,
+) -> None:
+    """
+    `measure` into `results`, except that a failing benchmark is reported
+    and skipped instead of aborting the run.
+    """
+    try:
+        results.append(await measure(name, call, iterations, warmup, concurrency))
+    except Exception as e:
+        print(f"{name} failed: {str(e).splitlines()[0] if str(e) else repr(e)}")
+
+
+def print_results(results: list[BenchmarkResult]) -> None:
+    width = max((len(r.name) for r in results), default=0)
+    print(f"{'benchmark':<{width}}  {'p50 ms':>10}  {'p99 ms':>10}  {'ops/sec':>10}")
+    for r in results:
+        print(
+            f"{r.name:<{width}}  {r.p50 * 1000:>10.3f}  {r.p99 * 1000:>10.3f}"
+            f"  {r.ops_per_sec:>10.1f}"
+        )
+
+
+def save_baseline(path: Path, results: list[BenchmarkResult]) -> None:
+    path.write_text(json.dumps({r.name: asdict(r) for r in results}, indent=2) + "\n")
+
+
+def compare_with_baseline(
+    path: Path, results: list[BenchmarkResult], tolerance: float
+) -> bool:
+    """
+    Prints p50 and throughput changes against a saved baseline. Returns
+    False when a benchmark got slower than `tolerance` (e.g. 0.1 for 10%)
+    on either of them.
+    """
+    baseline: dict[str, dict[str, Any]] = json.loads(path.read_text())
+    width = max((len(r.name) for r in results), default=0)
+    ok = True
+
+    print(f"{'benchmark':<{width}}  {'p50':>9}  {'ops/sec':>9}")
+    for r in results:
+        base = baseline.get(r.name)
+        if base is None:
+            print(f"{r.name:<{width}}  {'new':>9}  {'new':>9}")
+            continue
+
+        p50_change = r.p50 / base["p50"] - 1
+        ops_change = r.ops_per_sec / base["ops_per_sec"] - 1
+        regressed = p50_change > tolerance or ops_change < -tolerance
+        ok = ok and not regressed
+        print(
+            f"{r.name:<{width}}  {p50_change:>+9.1%}  {ops_change:>+9.1%}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+
+    return ok
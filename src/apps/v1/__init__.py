@@ -1,10 +1,20 @@
 from fastapi import APIRouter
 
+from src.core.config import settings
+from src.core.responses import PydanticJSONResponse
+from src.core.routing import PydanticJSONRoute
+
 from .healthcheck.router import router as healthcheck_router
+from .metrics.router import router as metrics_router
 
 
 router = APIRouter(
     prefix="/api/v1",
+    route_class=PydanticJSONRoute,
+    default_response_class=PydanticJSONResponse,
 )
 
 router.include_router(healthcheck_router)
+
+if settings.metrics.enabled:
+    router.include_router(metrics_router)
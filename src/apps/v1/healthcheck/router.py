@@ -10,9 +10,16 @@ from src.apps.v1.healthcheck.use_cases import (
     HealthCheckUseCaseProtocol,
     get_healthcheck_use_case,
 )
+from src.core.responses import PydanticJSONResponse
+from src.core.routing import PydanticJSONRoute
 
 
-router = APIRouter(prefix="/healthcheck", tags=["healthcheck"])
+router = APIRouter(
+    prefix="/healthcheck",
+    tags=["healthcheck"],
+    route_class=PydanticJSONRoute,
+    default_response_class=PydanticJSONResponse,
+)
 
 
 @router.get("/status", response_model=GeneralHeathCheckResponse)
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Literal, Optional
 
 from pydantic import BaseModel
@@ -14,5 +15,14 @@ class ServiceHealthcheckResponseSchema(BaseModel):
     error_message: Optional[str] = None
 
 
+class PoolStatusSchema(BaseModel):
+    name: str
+    checked_out: int
+    capacity: int
+    saturation: float
+
+
 class ServiceStatusResponseSchema(BaseModel):
     result: list[ServiceHealthcheckResponseSchema]
+    pools: list[PoolStatusSchema] = []
+    checked_at: Optional[datetime] = None
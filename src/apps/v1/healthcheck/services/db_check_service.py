@@ -1,10 +1,9 @@
 import time
-from typing import Annotated, Self, Literal
+from typing import Callable, Self, Literal
 
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import text
-from fastapi import Depends
 
 from src.apps.v1.healthcheck.schemas import ServiceHealthcheckResponseSchema
 from src.apps.v1.healthcheck.services.protocols import BaseHealthCheckServiceProtocol
@@ -12,18 +11,21 @@ from src.db.db_service import db_service
 
 
 class DBHealthCheckService(BaseHealthCheckServiceProtocol):
+    name: str = "db"
+
     def __init__(
         self: Self,
-        db_session: Annotated[AsyncSession, Depends(db_service.get_async_session)],
+        session_factory: Callable[[], AsyncSession] = db_service.read_session_factory,
     ) -> None:
-        self.db_session = db_session
+        self.session_factory = session_factory
 
     async def execute(self: Self) -> ServiceHealthcheckResponseSchema:
         error_message: str | None = None
         start: float = time.perf_counter()
         status: Literal["OK", "ERROR"] = "OK"
         try:
-            await self.db_session.execute(text("SELECT 1"))
+            async with self.session_factory() as session:
+                await session.execute(text("SELECT 1"))
         except Exception as e:
             status = "ERROR"
             error_message = str(e)
@@ -31,7 +33,7 @@ class DBHealthCheckService(BaseHealthCheckServiceProtocol):
             elapsed_time: float = round(time.perf_counter() - start, 5)
 
         return ServiceHealthcheckResponseSchema(
-            name="db",
+            name=self.name,
             status=status,
             response_time=elapsed_time,
             error_message=error_message,
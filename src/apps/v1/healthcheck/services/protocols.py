@@ -4,4 +4,6 @@ from src.apps.v1.healthcheck.schemas import ServiceHealthcheckResponseSchema
 
 
 class BaseHealthCheckServiceProtocol(Protocol):
+    name: str
+
     async def execute(self: Self) -> ServiceHealthcheckResponseSchema: ...
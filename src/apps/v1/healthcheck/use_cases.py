@@ -1,13 +1,18 @@
 import asyncio
-from typing import Protocol, Self, Annotated
-
-from fastapi import Depends
+import time
+from datetime import datetime, timezone
+from typing import Callable, Protocol, Self, Sequence
 
 from src.apps.v1.healthcheck.services import DBHealthCheckService
 from src.apps.v1.healthcheck.services.protocols import BaseHealthCheckServiceProtocol
 from src.apps.v1.healthcheck.schemas import (
+    PoolStatusSchema,
+    ServiceHealthcheckResponseSchema,
     ServiceStatusResponseSchema,
 )
+from src.core.config import settings
+from src.db.db_service import db_service
+from src.db.pool import InstrumentedAsyncAdaptedQueuePool
 
 
 class HealthCheckUseCaseProtocol(Protocol):
@@ -15,22 +20,110 @@ class HealthCheckUseCaseProtocol(Protocol):
 
 
 class HealthCheckUseCaseImpl(HealthCheckUseCaseProtocol):
+    """
+    Process-wide healthcheck that answers probes from a cache.
+
+    A background task started by the first `check()` refreshes the statuses
+    every `refresh_interval` seconds, so probes don't check out connections
+    themselves. If the cache is older than `ttl` (e.g. the refresher died),
+    one probe refreshes it while concurrent probes wait for that result.
+    Each service gets `timeout` seconds, so a saturated pool shows up as an
+    error instead of a hanging probe.
+    """
+
     def __init__(
-        self,
+        self: Self,
         *services_to_check: BaseHealthCheckServiceProtocol,
+        pools: Callable[[], Sequence[InstrumentedAsyncAdaptedQueuePool]] = list,
+        timeout: float = 2.0,
+        ttl: float = 15.0,
+        refresh_interval: float = 5.0,
     ) -> None:
         self.services_to_check = services_to_check
+        self.pools = pools
+        self.timeout = timeout
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._result: ServiceStatusResponseSchema | None = None
+        self._refreshed_at: float = float("-inf")
+        self._lock = asyncio.Lock()
+        self._refresher: asyncio.Task[None] | None = None
 
     async def check(self: Self) -> ServiceStatusResponseSchema:
-        check_results = await asyncio.gather(
-            *[service.execute() for service in self.services_to_check]
-        )
-        return ServiceStatusResponseSchema(result=check_results)
-
-
-def get_healthcheck_use_case(
-    db_check_service: Annotated[
-        BaseHealthCheckServiceProtocol, Depends(DBHealthCheckService)
-    ],
-) -> HealthCheckUseCaseProtocol:
-    return HealthCheckUseCaseImpl(db_check_service)
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_periodically())
+
+        if self._result is None or time.monotonic() - self._refreshed_at > self.ttl:
+            return await self.refresh(max_age=self.ttl)
+
+        return self._result
+
+    async def refresh(self: Self, max_age: float = 0.0) -> ServiceStatusResponseSchema:
+        async with self._lock:
+            # Someone else refreshed while we were waiting for the lock
+            if (
+                self._result is not None
+                and time.monotonic() - self._refreshed_at <= max_age
+            ):
+                return self._result
+
+            check_results = await asyncio.gather(
+                *[self._check_service(service) for service in self.services_to_check]
+            )
+            self._result = ServiceStatusResponseSchema(
+                result=check_results,
+                pools=[
+                    PoolStatusSchema(
+                        name=pool.name,
+                        checked_out=pool.checkedout(),
+                        capacity=pool.capacity,
+                        saturation=round(pool.checkedout() / pool.capacity, 3)
+                        if pool.capacity
+                        else 0.0,
+                    )
+                    for pool in self.pools()
+                ],
+                checked_at=datetime.now(timezone.utc),
+            )
+            self._refreshed_at = time.monotonic()
+
+            return self._result
+
+    async def close(self: Self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
+
+    async def _refresh_periodically(self: Self) -> None:
+        # The probe that started the refresher refreshes on its own
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    async def _check_service(
+        self: Self, service: BaseHealthCheckServiceProtocol
+    ) -> ServiceHealthcheckResponseSchema:
+        start: float = time.perf_counter()
+        try:
+            return await asyncio.wait_for(service.execute(), self.timeout)
+        except TimeoutError:
+            return ServiceHealthcheckResponseSchema(
+                name=service.name,
+                status="ERROR",
+                response_time=round(time.perf_counter() - start, 5),
+                error_message=f"Timed out after {self.timeout}s",
+            )
+
+
+healthcheck_use_case = HealthCheckUseCaseImpl(
+    DBHealthCheckService(),
+    pools=lambda: db_service.pools,
+    timeout=settings.healthcheck.service_timeout,
+    ttl=settings.healthcheck.cache_ttl,
+    refresh_interval=settings.healthcheck.refresh_interval,
+)
+
+
+def get_healthcheck_use_case() -> HealthCheckUseCaseProtocol:
+    return healthcheck_use_case
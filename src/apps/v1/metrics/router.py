@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Response
+
+from src.core.metrics import render_metrics
+from src.core.responses import PydanticJSONResponse
+from src.core.routing import PydanticJSONRoute
+
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    route_class=PydanticJSONRoute,
+    default_response_class=PydanticJSONResponse,
+)
+
+
+@router.get("", response_class=Response, include_in_schema=False)
+async def get_metrics() -> Response:
+    """
+    Prometheus scrape endpoint, aggregated over all workers.
+    """
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
@@ -3,15 +3,23 @@ from typing import AsyncIterator
 
 from fastapi import FastAPI
 
+from src.apps.v1.healthcheck.use_cases import healthcheck_use_case
 from src.db.db_service import db_service
 from src.core.config import settings
+from src.core.request_tracker import RequestTracker
 from src.middlewares import apply_middlewares
 from src.routers import apply_routers
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Runs in every worker, after gunicorn forked it from the master
+    await db_service.warm_up(settings.db.warm_up_connections)
+
     yield
+
+    await app.state.request_tracker.drain(settings.fastapi.drain_timeout)
+    await healthcheck_use_case.close()
     await db_service.dispose()
 
 
@@ -22,7 +30,9 @@ def create_app() -> FastAPI:
         version=settings.fastapi.version,
         docs_url=settings.fastapi.docs_url,
         redoc_url=settings.fastapi.redoc_url,
+        lifespan=lifespan,
     )
+    app.state.request_tracker = RequestTracker()
 
     app = apply_routers(apply_middlewares(app))
 
@@ -8,6 +8,11 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 BASE_DIR: Path = Path(__file__).parent.parent.parent
 
 
+class DBReplicaConfig(BaseModel):
+    host: str
+    port: int = 5432
+
+
 class DBConfig(BaseModel):
     user: str = "user"
     password: str = "password"
@@ -20,6 +25,34 @@ class DBConfig(BaseModel):
     echo_pool: bool = False
     pool_size: int = 50
     max_overflow: int = 10
+    # Connections opened per pool when a worker starts (at most pool_size)
+    warm_up_connections: int = 5
+    # Primary keys of UUIDPkMixin. uuid7 keys are time-ordered, so inserts
+    # append to the right of the primary key index instead of splitting
+    # random pages. Existing uuid4 keys stay valid when switching.
+    uuid_pk_strategy: Literal["uuid4", "uuid7"] = "uuid7"
+
+    # Prepared statements cached per connection by SQLAlchemy's asyncpg dialect
+    prepared_statement_cache_size: int = 100
+    # asyncpg's own per-connection statement cache
+    statement_cache_size: int = 100
+    # Compiled statements cached per engine by SQLAlchemy
+    query_cache_size: int = 500
+    # PgBouncer in transaction/statement mode hands each transaction a random
+    # server connection, so named prepared statements can't be reused: both
+    # statement caches are disabled and statement names are made unique
+    pgbouncer: bool = False
+
+    replicas: list[DBReplicaConfig] = []
+    replica_selection: Literal["round_robin", "least_busy"] = "round_robin"
+    # Seconds an unreachable replica is skipped before it's tried again
+    replica_retry_interval: float = 30.0
+    # Seconds after a client's commit during which its reads still go to the
+    # primary, set it above the replica lag. The commit time is kept in the
+    # read_your_writes_cookie, so it holds across workers. Repository caches
+    # don't store replica reads of keys invalidated within this window.
+    read_your_writes_window: float = 0.0
+    read_your_writes_cookie: str = "last_write"
 
     naming_convention: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
@@ -33,12 +66,21 @@ class DBConfig(BaseModel):
     def url(self: Self) -> str:
         return f"{self.provider}://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
 
+    @property
+    def replica_urls(self: Self) -> list[str]:
+        return [
+            f"{self.provider}://{self.user}:{self.password}@{r.host}:{r.port}/{self.name}"
+            for r in self.replicas
+        ]
+
 
 class GunicornConfig(BaseModel):
     host: str = "127.0.0.1"
     port: int = 8000
     workers: int = 4
     timeout: int = 900
+    # Seconds workers get to finish in-flight requests on shutdown or reload
+    graceful_timeout: int = 30
     loglevel: Literal[
         "debug",
         "info",
@@ -55,6 +97,89 @@ class FastApiConfig(BaseModel):
     docs_url: str | None = "/docs"
     redoc_url: str | None = "/redoc"
     log_requests: bool = True
+    # Seconds the lifespan shutdown waits for in-flight requests, keep it
+    # below gunicorn.graceful_timeout
+    drain_timeout: float = 25.0
+
+
+class HealthCheckConfig(BaseModel):
+    # Seconds between background refreshes of the cached service statuses
+    refresh_interval: float = 5.0
+    # Cached statuses older than this are refreshed by the probe itself
+    cache_ttl: float = 15.0
+    # Seconds a single service check may take before it's reported as failed
+    service_timeout: float = 2.0
+
+
+class RequestsLogConfig(BaseModel):
+    directory: Path = BASE_DIR / "logs"
+    max_bytes: int = 10 * 1024 * 1024
+    backup_count: int = 10
+    # Max records written to the file in one go
+    batch_size: int = 256
+    # Captured request bodies are truncated to this many bytes
+    body_max_size: int = 4096
+    # Path prefixes whose request bodies are never captured
+    skip_body_paths: list[str] = []
+
+
+class QueryLogConfig(BaseModel):
+    enabled: bool = True
+    directory: Path = BASE_DIR / "logs"
+    # Statements slower than this many seconds go to the slow query log
+    slow_query_threshold: float = 0.5
+    # Executions of one statement within a request before it's flagged as N+1
+    n_plus_one_threshold: int = 10
+    # X-DB-Query-Count and X-DB-Time response headers, meant for dev only
+    debug_headers: bool = False
+
+
+class MetricsConfig(BaseModel):
+    enabled: bool = True
+    # mmap files of all gunicorn workers, aggregated by the metrics endpoint.
+    # Wiped when the gunicorn master starts.
+    multiproc_dir: Path = BASE_DIR / "metrics"
+    latency_buckets: list[float] = [
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    ]
+
+
+class LoadSheddingConfig(BaseModel):
+    enabled: bool = True
+    # Concurrent requests admitted per worker, adjusted between min and max
+    initial_limit: int = 100
+    min_limit: int = 5
+    max_limit: int = 1000
+    # Pool checkouts waiting longer than this many seconds shrink the limit
+    target_checkout_wait: float = 0.05
+    # Factor the limit is multiplied by on a slow checkout
+    backoff: float = 0.9
+    # Seconds between two decreases, so that one burst counts once
+    cooldown: float = 1.0
+    # Retry-After of the 503 responses, in seconds
+    retry_after: int = 1
+    # Path prefixes that are never shed
+    exempt_paths: list[str] = ["/api/v1/healthcheck", "/api/v1/metrics"]
+
+
+class DeadlineConfig(BaseModel):
+    enabled: bool = True
+    # Seconds a request may take unless its route or the client says otherwise
+    default_timeout: float | None = 30.0
+    # Upper bound of the timeout a client may ask for in the header
+    max_timeout: float = 300.0
+    # Request header with the timeout in seconds
+    header: str = "x-request-timeout"
 
 
 class CorsConfig(BaseModel):
@@ -87,6 +212,12 @@ class Settings(BaseSettings):
     db: DBConfig = DBConfig()
     gunicorn: GunicornConfig = GunicornConfig()
     fastapi: FastApiConfig = FastApiConfig()
+    healthcheck: HealthCheckConfig = HealthCheckConfig()
+    requests_log: RequestsLogConfig = RequestsLogConfig()
+    query_log: QueryLogConfig = QueryLogConfig()
+    metrics: MetricsConfig = MetricsConfig()
+    load_shedding: LoadSheddingConfig = LoadSheddingConfig()
+    deadline: DeadlineConfig = DeadlineConfig()
     cors: CorsConfig = CorsConfig()
     dev: DevConfig = DevConfig()
 
@@ -0,0 +1,70 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Self
+
+
+class DeadlineExceededError(TimeoutError):
+    """The request's time budget ran out before the work started"""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    # time.monotonic() of when the request arrived
+    started_at: float
+    timeout: float
+    # Requested by the client, which takes precedence over route defaults
+    from_header: bool = False
+
+    def remaining(self: Self) -> float:
+        return self.started_at + self.timeout - time.monotonic()
+
+
+# Deadline of the request being handled, set by DeadlineMiddleware
+current_deadline: ContextVar[Deadline | None] = ContextVar(
+    "current_deadline", default=None
+)
+
+
+def remaining_time() -> float | None:
+    """
+    Seconds left until the current request's deadline, None without one.
+    """
+    deadline = current_deadline.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+# Starts cancelling the current request on client disconnect, set by
+# DeadlineMiddleware
+current_disconnect_watch: ContextVar[Callable[[], None] | None] = ContextVar(
+    "current_disconnect_watch", default=None
+)
+
+
+def watch_disconnect() -> None:
+    """
+    From now on, cancel the current request once its client disconnects.
+    Called when a request starts a database transaction, so requests that
+    never query don't pay for watching the connection.
+    """
+    watch = current_disconnect_watch.get()
+    if watch is not None:
+        watch()
+
+
+def request_timeout(timeout: float) -> Callable[[], Awaitable[None]]:
+    """
+    Route dependency overriding the default deadline of the route's requests,
+    e.g. `dependencies=[Depends(request_timeout(5))]`. A deadline sent by the
+    client in the request header still wins.
+    """
+
+    async def set_deadline() -> None:
+        deadline = current_deadline.get()
+        if deadline is not None and deadline.from_header:
+            return
+
+        started_at = deadline.started_at if deadline is not None else time.monotonic()
+        current_deadline.set(Deadline(started_at, timeout))
+
+    return set_deadline
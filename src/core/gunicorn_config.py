@@ -1,4 +1,9 @@
+import os
+import shutil
+from typing import Any
+
 from src.core.config import BASE_DIR, settings
+from src.core.log_sink import WORKER_SLOT_ENV
 
 
 command: str = str(BASE_DIR / ".venv/bin/gunicorn")
@@ -6,9 +11,39 @@ pythonpath: str = str(BASE_DIR)
 bind: str = f"{settings.gunicorn.host}:{settings.gunicorn.port}"
 workers: int = settings.gunicorn.workers
 worker_class: str = "uvicorn.workers.UvicornWorker"
+# Workers fork from a master that already imported the app. Engines and log
+# writers are created lazily in every worker, see DataBaseService.
+preload_app: bool = True
+graceful_timeout: int = settings.gunicorn.graceful_timeout
 
 accesslog: str | None = None
 errorlog: str = f"{BASE_DIR}/logs/gunicorn.error.log"
 
 capture_output = True
 loglevel: str = settings.gunicorn.loglevel
+
+# Must be set before prometheus_client is imported, workers inherit it. With
+# preload_app the master imports the app right after this file, before any
+# server hook runs. Values left by a previous run would be summed with the
+# new ones, but a config reload (HUP) finds the variable set and keeps the
+# files of the live workers.
+if settings.metrics.enabled and os.environ.get("PROMETHEUS_MULTIPROC_DIR") != str(
+    settings.metrics.multiproc_dir
+):
+    shutil.rmtree(settings.metrics.multiproc_dir, ignore_errors=True)
+    settings.metrics.multiproc_dir.mkdir(parents=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(settings.metrics.multiproc_dir)
+
+
+def pre_fork(server: Any, worker: Any) -> None:
+    # The lowest slot no live worker holds, the forked worker inherits it
+    taken = {getattr(w, "slot", None) for w in server.WORKERS.values()}
+    worker.slot = next(slot for slot in range(len(taken) + 1) if slot not in taken)
+    os.environ[WORKER_SLOT_ENV] = str(worker.slot)
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    if settings.metrics.enabled:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)  # type: ignore[no-untyped-call]
@@ -0,0 +1,72 @@
+import os
+import time
+from typing import Self
+
+from src.core.metrics import CONCURRENCY_LIMIT
+from src.core.request_tracker import RequestTracker
+from src.db.pool import InstrumentedAsyncAdaptedQueuePool
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on the requests a worker handles at once, driven by how long
+    requests wait for a pooled connection.
+
+    A checkout that waited longer than `target_wait` means the database (or
+    the pool) can't keep up, so the limit is multiplied by `backoff`, at
+    most once per `cooldown` seconds. A fast checkout while at least half of
+    the limit is in use grows it by `1 / limit`, i.e. by about one for every
+    `limit` requests. The in-flight count comes from `tracker`.
+
+    Registered as an observer of `InstrumentedAsyncAdaptedQueuePool`.
+    """
+
+    def __init__(
+        self: Self,
+        tracker: RequestTracker,
+        initial_limit: int = 100,
+        min_limit: int = 5,
+        max_limit: int = 1000,
+        target_wait: float = 0.05,
+        backoff: float = 0.9,
+        cooldown: float = 1.0,
+    ) -> None:
+        self.tracker = tracker
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_wait = target_wait
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.limit: float = float(initial_limit)
+        self._decreased_at: float = float("-inf")
+        # With preload_app the limiter is created in the gunicorn master, whose
+        # gauge would never be marked dead, so each worker reports its own
+        self._reported_pid: int | None = None
+
+    def admit(self: Self) -> bool:
+        if self._reported_pid != os.getpid():
+            self._reported_pid = os.getpid()
+            CONCURRENCY_LIMIT.set(self.limit)
+
+        # The tracker already counts the request asking for admission
+        return self.tracker.in_flight <= int(self.limit)
+
+    def checked_out(
+        self: Self, pool: InstrumentedAsyncAdaptedQueuePool, waited: float
+    ) -> None:
+        if waited > self.target_wait:
+            now = time.monotonic()
+            if now - self._decreased_at < self.cooldown:
+                return
+
+            self._decreased_at = now
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif self.tracker.in_flight * 2 >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        else:
+            return
+
+        CONCURRENCY_LIMIT.set(self.limit)
+
+    def checked_in(self: Self, pool: InstrumentedAsyncAdaptedQueuePool) -> None:
+        pass
@@ -0,0 +1,181 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Self
+
+
+# Set by the gunicorn master for each worker it forks, see gunicorn_config
+WORKER_SLOT_ENV = "GUNICORN_WORKER_SLOT"
+
+# Creation time, message and data fields of one line
+LogEntry = tuple[float, str, dict[str, Any]]
+
+
+def format_json_line(entry: LogEntry, pid: int) -> str:
+    """
+    One JSON object per entry: timestamp, worker pid, the message and the
+    data fields.
+    """
+    created, message, data = entry
+    payload: dict[str, Any] = {
+        "ts": datetime.fromtimestamp(created, timezone.utc).isoformat(),
+        "pid": pid,
+        "message": message,
+    }
+    payload.update(data)
+    return json.dumps(payload, default=str)
+
+
+class BatchRotatingFileHandler(RotatingFileHandler):
+    def emit_lines(self: Self, lines: list[str]) -> None:
+        try:
+            data = "".join(line + self.terminator for line in lines)
+            with self.lock:  # type: ignore[union-attr]
+                if self.stream is None:
+                    self.stream = self._open()
+                size = self.stream.tell()
+                if self.maxBytes and size and size + len(data) >= self.maxBytes:
+                    self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+                self.stream.write(data)
+                self.stream.flush()
+        except Exception:
+            if logging.raiseExceptions:
+                traceback.print_exc(file=sys.stderr)
+
+
+class BatchingQueueListener:
+    """
+    Drains the queue from a background thread, formats everything that piled
+    up since the last write (up to `batch_size` entries) and writes it in one
+    call.
+    """
+
+    _sentinel = None
+
+    def __init__(
+        self: Self,
+        queue: "queue.SimpleQueue[LogEntry | None]",
+        handler: BatchRotatingFileHandler,
+        batch_size: int = 256,
+    ) -> None:
+        self.queue = queue
+        self.handler = handler
+        self.batch_size = batch_size
+        self._thread: threading.Thread | None = None
+
+    def start(self: Self) -> None:
+        self._thread = threading.Thread(target=self._monitor, daemon=True)
+        self._thread.start()
+
+    def stop(self: Self) -> None:
+        if self._thread is not None:
+            self.queue.put(self._sentinel)
+            self._thread.join()
+            self._thread = None
+        self.handler.close()
+
+    def _monitor(self: Self) -> None:
+        pid = os.getpid()
+        stop = False
+        while not stop:
+            entry = self.queue.get()
+            if entry is self._sentinel:
+                break
+
+            batch = [entry]
+            while len(batch) < self.batch_size:
+                try:
+                    entry = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is self._sentinel:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            lines: list[str] = []
+            for entry in batch:
+                try:
+                    lines.append(format_json_line(entry, pid))
+                except Exception:
+                    if logging.raiseExceptions:
+                        traceback.print_exc(file=sys.stderr)
+
+            self.handler.emit_lines(lines)
+
+
+class JSONLinesLogSink:
+    """
+    Non-blocking JSON lines log for multi-process servers.
+
+    `log` only puts the entry on a queue. It bypasses `logging`, so no
+    LogRecord, caller lookup or QueueHandler.prepare runs on the event loop.
+    JSON formatting and batched file writes happen in a background thread,
+    which is why `data` must not be mutated after it is logged. Every
+    gunicorn worker writes and rotates its own `<name>.<slot>.jsonl` file. A
+    worker that replaces a dead one takes over its slot and file, so restarts
+    do not leave new rotation sets behind. A process not started by gunicorn
+    uses slot 0. The writer is (re)started on first use in each process,
+    which keeps it fork safe.
+    """
+
+    def __init__(
+        self: Self,
+        name: str,
+        directory: Path,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 10,
+        batch_size: int = 256,
+    ) -> None:
+        self.name = name
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self._queue: queue.SimpleQueue[LogEntry | None] = queue.SimpleQueue()
+        self._listener: BatchingQueueListener | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def log(self: Self, message: str, data: dict[str, Any]) -> None:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._start()
+
+        self._queue.put((time.time(), message, data))
+
+    def stop(self: Self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        self._pid = None
+
+    def _start(self: Self) -> None:
+        # A listener inherited through fork has no running thread, drop it
+        self._listener = None
+
+        slot = os.environ.get(WORKER_SLOT_ENV, "0")
+        handler = BatchRotatingFileHandler(
+            self.directory / f"{self.name}.{slot}.jsonl",
+            maxBytes=self.max_bytes,
+            backupCount=self.backup_count,
+            delay=True,
+        )
+
+        self._queue = queue.SimpleQueue()
+        self._listener = BatchingQueueListener(self._queue, handler, self.batch_size)
+        self._listener.start()
+        self._pid = os.getpid()
+        atexit.register(self.stop)
@@ -0,0 +1,136 @@
+import functools
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Self, TypeVar, cast
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+
+from src.core.config import settings
+from src.db.pool import InstrumentedAsyncAdaptedQueuePool
+
+
+MethodType = TypeVar("MethodType", bound=Callable[..., Awaitable[Any]])
+
+# "<RepositoryClass>.<method>" of the repository call in progress, if any
+current_repository_method: ContextVar[str | None] = ContextVar(
+    "current_repository_method", default=None
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route"],
+    buckets=settings.metrics.latency_buckets,
+)
+HTTP_REQUESTS = Counter(
+    "http_requests",
+    "HTTP responses by route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_SHED = Counter(
+    "http_requests_shed",
+    "Requests rejected with 503 by the adaptive concurrency limit.",
+)
+CONCURRENCY_LIMIT = Gauge(
+    "http_concurrency_limit",
+    "Adaptive concurrency limit, summed over workers.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool.",
+    ["pool"],
+    buckets=settings.metrics.latency_buckets,
+)
+# Gauges of dead workers are dropped, see child_exit in gunicorn_config.py
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Connections checked out from the pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_capacity",
+    "Max connections of the pool (pool_size + max_overflow).",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement latency by the route and repository method that issued it.",
+    ["route", "repository_method"],
+    buckets=settings.metrics.latency_buckets,
+)
+REPOSITORY_METHOD_DURATION = Histogram(
+    "repository_method_duration_seconds",
+    "Repository method latency.",
+    ["repository", "method"],
+    buckets=settings.metrics.latency_buckets,
+)
+
+
+class PoolMetricsObserver:
+    def checked_out(
+        self: Self, pool: InstrumentedAsyncAdaptedQueuePool, waited: float
+    ) -> None:
+        DB_POOL_CHECKOUT_WAIT.labels(pool.name).observe(waited)
+        self._update(pool)
+
+    def checked_in(self: Self, pool: InstrumentedAsyncAdaptedQueuePool) -> None:
+        self._update(pool)
+
+    @staticmethod
+    def _update(pool: InstrumentedAsyncAdaptedQueuePool) -> None:
+        DB_POOL_CONNECTIONS.labels(pool.name).set(pool.checkedout())
+        DB_POOL_CAPACITY.labels(pool.name).set(pool.capacity)
+
+
+InstrumentedAsyncAdaptedQueuePool.observers.append(PoolMetricsObserver())
+
+
+def timed_repository_method(method: MethodType) -> MethodType:
+    """
+    Records the duration of a repository method and exposes it as
+    `current_repository_method` while it runs.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    async def wrapper(self: Any, /, *args: Any, **kwargs: Any) -> Any:
+        repository = type(self).__name__
+        token = current_repository_method.set(f"{repository}.{name}")
+        started_at = time.perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            REPOSITORY_METHOD_DURATION.labels(repository, name).observe(
+                time.perf_counter() - started_at
+            )
+            current_repository_method.reset(token)
+
+    return cast(MethodType, wrapper)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Metrics in the Prometheus text format. Under gunicorn every worker writes
+    its values to `PROMETHEUS_MULTIPROC_DIR` and they are summed here, so any
+    worker answers for all of them.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -1 +1,7 @@
+from .deadline import DeadlineMiddleware as DeadlineMiddleware
+from .load_shedding import LoadSheddingMiddleware as LoadSheddingMiddleware
+from .metrics import MetricsMiddleware as MetricsMiddleware
+from .query_stats import QueryStatsMiddleware as QueryStatsMiddleware
+from .read_your_writes import ReadYourWritesMiddleware as ReadYourWritesMiddleware
+from .request_tracker import RequestTrackerMiddleware as RequestTrackerMiddleware
 from .requests_log import RequestsLogMiddleware as RequestsLogMiddleware
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from typing import Self
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.deadlines import Deadline, current_deadline, current_disconnect_watch
+
+
+class DisconnectWatcher:
+    """
+    Passes the request messages on to the app and, once `watch` is called,
+    cancels `task` if the client disconnects before the response is
+    complete. Until then nothing runs besides the app itself.
+
+    The connection is read by the app's own pending `receive`, if there is
+    one, or by a reader task that hands the messages to the app one at a
+    time, so the request body is read only as fast as the app consumes it.
+    """
+
+    def __init__(self: Self, receive: Receive, task: asyncio.Task[object]) -> None:
+        self.task = task
+        self.watching = False
+        self.response_complete = False
+        self.cancelled = False
+        self._receive = receive
+        self._receiving = 0
+        self._disconnect: Message | None = None
+        self._reader: asyncio.Task[None] | None = None
+        self._messages: asyncio.Queue[Message] | None = None
+
+    async def receive(self: Self) -> Message:
+        if self._messages is not None:
+            if self._disconnect is not None and self._messages.empty():
+                return self._disconnect
+
+            return await self._messages.get()
+
+        if self._disconnect is not None:
+            return self._disconnect
+
+        self._receiving += 1
+        try:
+            message = await self._receive()
+        finally:
+            self._receiving -= 1
+
+        self._observe(message)
+        self._start_reader()
+        return message
+
+    def watch(self: Self) -> None:
+        if not self.watching:
+            self.watching = True
+            self._start_reader()
+
+    def close(self: Self) -> None:
+        self.watching = False
+        if self._reader is not None:
+            self._reader.cancel()
+
+    def _start_reader(self: Self) -> None:
+        # A receive the app is waiting on sees the disconnect by itself
+        if (
+            self.watching
+            and self._reader is None
+            and self._receiving == 0
+            and self._disconnect is None
+        ):
+            self._messages = asyncio.Queue(maxsize=1)
+            self._reader = asyncio.get_running_loop().create_task(
+                self._read(self._messages)
+            )
+
+    async def _read(self: Self, messages: asyncio.Queue[Message]) -> None:
+        while self._disconnect is None:
+            message = await self._receive()
+            self._observe(message)
+            await messages.put(message)
+
+    def _observe(self: Self, message: Message) -> None:
+        if message["type"] != "http.disconnect":
+            return
+
+        self._disconnect = message
+        # After the response, the app may still run background tasks
+        if self.watching and not self.response_complete and not self.cancelled:
+            self.cancelled = True
+            self.task.cancel()
+
+
+class DeadlineMiddleware:
+    """
+    Gives every HTTP request a deadline: `default_timeout` seconds, which
+    routes may change (see `request_timeout`), or the seconds sent in the
+    `header`, capped at `max_timeout`. Repository sessions turn what's left
+    of it into the Postgres `statement_timeout`.
+
+    Once a request starts a database transaction (see `watch_disconnect`),
+    a client disconnect before the response is complete cancels it, and
+    with it the query it waits for, instead of running it to completion.
+    A disconnect after the response leaves background tasks running.
+    """
+
+    def __init__(
+        self: Self,
+        app: ASGIApp,
+        default_timeout: float | None = 30.0,
+        max_timeout: float = 300.0,
+        header: str = "x-request-timeout",
+    ) -> None:
+        self.app = app
+        self.default_timeout = default_timeout
+        self.max_timeout = max_timeout
+        self.header = header
+        self._raw_header = header.lower().encode("latin-1")
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        task = asyncio.current_task()
+        if scope["type"] != "http" or task is None:
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.monotonic()
+        deadline = None
+        requested = self._requested_timeout(scope)
+        if requested is not None:
+            deadline = Deadline(started_at, requested, from_header=True)
+        elif self.default_timeout is not None:
+            deadline = Deadline(started_at, self.default_timeout)
+
+        watcher = DisconnectWatcher(receive, task)
+        token = current_deadline.set(deadline)
+        watch_token = current_disconnect_watch.set(watcher.watch)
+
+        async def send_tracking_completion(message: Message) -> None:
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                watcher.response_complete = True
+            await send(message)
+
+        try:
+            await self.app(scope, watcher.receive, send_tracking_completion)
+        except asyncio.CancelledError:
+            # Cancelled by the watcher: the client is gone, nobody to respond
+            # to. Cancellations from elsewhere still propagate.
+            if not watcher.cancelled or task.uncancel() > 0:
+                raise
+        else:
+            if watcher.cancelled:
+                # The app swallowed the watcher's cancellation
+                task.uncancel()
+        finally:
+            watcher.close()
+            current_disconnect_watch.reset(watch_token)
+            current_deadline.reset(token)
+
+    def _requested_timeout(self: Self, scope: Scope) -> float | None:
+        # Scanned in place, it runs on every request
+        value = next((v for k, v in scope["headers"] if k == self._raw_header), None)
+        if value is None:
+            return None
+
+        try:
+            timeout = float(value)
+        except ValueError:
+            return None
+
+        if timeout <= 0:
+            return None
+
+        return min(timeout, self.max_timeout)
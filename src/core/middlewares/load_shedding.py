@@ -0,0 +1,46 @@
+from typing import Self, Sequence
+
+from fastapi import status
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.load_shedding import AdaptiveConcurrencyLimiter
+from src.core.metrics import HTTP_REQUESTS_SHED
+from src.core.responses import PydanticJSONResponse
+
+
+class LoadSheddingMiddleware:
+    """
+    Rejects requests over the limiter's concurrency limit right away with
+    `503 Service Unavailable` and `Retry-After`, instead of letting them
+    queue for a pooled connection. Paths starting with one of
+    `exempt_paths` (e.g. healthchecks) are always admitted.
+    """
+
+    def __init__(
+        self: Self,
+        app: ASGIApp,
+        limiter: AdaptiveConcurrencyLimiter,
+        retry_after: int = 1,
+        exempt_paths: Sequence[str] = (),
+    ) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.retry_after = retry_after
+        self.exempt_paths = tuple(exempt_paths)
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["path"].startswith(self.exempt_paths)
+            or self.limiter.admit()
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        HTTP_REQUESTS_SHED.inc()
+        response = PydanticJSONResponse(
+            {"detail": "The server is overloaded, retry later."},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,51 @@
+from typing import Self
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.query_instrumentation import (
+    QueryInstrumentation,
+    QueryStats,
+    current_query_stats,
+)
+
+
+class QueryStatsMiddleware:
+    """
+    Collects the statements of every HTTP request and reports likely N+1
+    patterns once it's done. With `debug_headers` the query count and total
+    DB time in milliseconds so far are sent as `X-DB-Query-Count` and
+    `X-DB-Time` headers, which is not meant for production.
+    """
+
+    def __init__(
+        self: Self,
+        app: ASGIApp,
+        instrumentation: QueryInstrumentation,
+        debug_headers: bool = False,
+    ) -> None:
+        self.app = app
+        self.instrumentation = instrumentation
+        self.debug_headers = debug_headers
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.debug_headers:
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Query-Count", str(stats.count))
+                headers.append("X-DB-Time", f"{stats.duration * 1000:.2f}")
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            self.instrumentation.check_request(stats)
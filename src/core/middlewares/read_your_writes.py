@@ -0,0 +1,67 @@
+import time
+from http.cookies import SimpleCookie
+from typing import Self
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.db.read_your_writes import WriteTracker, current_write_tracker
+
+
+class ReadYourWritesMiddleware:
+    """
+    Keeps the reads of a client on the primary for `window` seconds after
+    that client's last commit, whichever worker or host serves it. The
+    commit time travels in the `cookie`, which is set on responses of
+    requests that committed before the response started (e.g. through
+    `get_unit_of_work`) and expires with the window. Clients that drop the
+    cookie, and other clients, may read from a lagging replica.
+    """
+
+    def __init__(
+        self: Self, app: ASGIApp, window: float, cookie: str = "last_write"
+    ) -> None:
+        self.app = app
+        self.window = window
+        self.cookie = cookie
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tracker = WriteTracker(self._last_commit_at(scope))
+        token = current_write_tracker.set(tracker)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and tracker.committed:
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{self.cookie}={tracker.last_commit_at:.3f}; "
+                    f"Max-Age={max(int(self.window), 1)}; Path=/; HttpOnly; "
+                    "SameSite=Lax",
+                )
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_write_tracker.reset(token)
+
+    def _last_commit_at(self: Self, scope: Scope) -> float | None:
+        header = Headers(scope=scope).get("cookie")
+        if header is None:
+            return None
+
+        morsel = SimpleCookie(header).get(self.cookie)
+        if morsel is None:
+            return None
+
+        try:
+            last_commit_at = float(morsel.value)
+        except ValueError:
+            return None
+
+        # A commit time from the future can only be forged, ignore it
+        return last_commit_at if last_commit_at <= time.time() else None
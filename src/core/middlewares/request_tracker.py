@@ -0,0 +1,22 @@
+from typing import Self
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.request_tracker import RequestTracker
+
+
+class RequestTrackerMiddleware:
+    def __init__(self: Self, app: ASGIApp, tracker: RequestTracker) -> None:
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.tracker.started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.tracker.finished()
@@ -1,62 +1,124 @@
-import json
 import time
-import logging
-from logging.handlers import RotatingFileHandler
-from typing import Callable, Awaitable, Any
+from typing import Any, Sequence, Self
 
-from fastapi.responses import Response
-from fastapi.requests import Request
-from starlette.datastructures import QueryParams
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from src.core.config import BASE_DIR
+from src.core.log_sink import JSONLinesLogSink
 
 
-class RequestsLogMiddleware(BaseHTTPMiddleware):
+class RequestsLogMiddleware:
     """
     My workaround of the issue when access_log_format is not working with
     UvicornWorker worker_class with gunicorn, so we can't use the following
     syntax: https://docs.gunicorn.org/en/latest/settings.html#access-log-format
+
+    Pure ASGI middleware: the request body is teed from `receive` as the app
+    reads it (up to `body_max_size` bytes) instead of being buffered upfront,
+    so uploads keep streaming. Timing runs from the first `receive` to the
+    final `send`. Records go to `sink` as JSON lines.
     """
 
-    LOGGER: logging.Logger = logging.Logger("requests", level=logging.INFO)
-    FORMATTER: logging.Formatter = logging.Formatter("[%(asctime)s] %(message)s")
-    HANDLER: RotatingFileHandler = RotatingFileHandler(
-        f"{BASE_DIR}/logs/requests.log",
-        maxBytes=10 * 1024 * 1024,
-        backupCount=10,
-    )
-    HANDLER.setFormatter(FORMATTER)
-    LOGGER.addHandler(HANDLER)
-
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        body: bytes = await request.body()
-        query: QueryParams = request.query_params
-        start_time: float = time.perf_counter()
-        response: Response = await call_next(request)
-
-        content_type: str = request.headers.get("content-type", "")
-        if body and content_type.startswith("application/json"):
-            try:
-                body_content: Any = json.loads(body)
-                body_str: str = json.dumps(body_content)
-            except json.JSONDecodeError:
-                body_str = "Invalid JSON"
-        else:
-            body_str = f"Non-JSON body, Content-Type: {content_type}"
-
-        response_time: str = f"{time.perf_counter() - start_time:.5f}"
-
-        self.LOGGER.info(
-            "%s %s%s%s | %d | Response Time: %s",
-            request.method,
-            request.url.path,
-            f" | QueryParams: {query}" if query else "",
-            f" | Body: {body_str}" if body else "",
-            response.status_code,
-            response_time,
-        )
-
-        return response
+    def __init__(
+        self: Self,
+        app: ASGIApp,
+        sink: JSONLinesLogSink,
+        body_max_size: int = 4096,
+        skip_body_paths: Sequence[str] = (),
+    ) -> None:
+        self.app = app
+        self.sink = sink
+        self.body_max_size = body_max_size
+        self.skip_body_paths = tuple(skip_body_paths)
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        entered_at: float = time.perf_counter()
+        started_at: float | None = None
+        capture_body: bool = not scope["path"].startswith(self.skip_body_paths)
+        body = bytearray()
+        body_size: int = 0
+        status_code: int = 500
+        logged: bool = False
+
+        async def receive_wrapper() -> Message:
+            nonlocal started_at, body_size
+            message = await receive()
+            if started_at is None:
+                started_at = time.perf_counter()
+
+            if capture_body and message["type"] == "http.request":
+                chunk: bytes = message.get("body", b"")
+                body_size += len(chunk)
+                if len(body) < self.body_max_size:
+                    body.extend(chunk[: self.body_max_size - len(body)])
+
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, logged
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+            await send(message)
+
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                logged = True
+                self.log(
+                    scope,
+                    status_code,
+                    time.perf_counter() - (started_at or entered_at),
+                    bytes(body),
+                    body_size,
+                )
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception:
+            if logged:
+                raise
+
+            self.log(
+                scope,
+                500,
+                time.perf_counter() - (started_at or entered_at),
+                bytes(body),
+                body_size,
+            )
+            raise
+
+    def log(
+        self: Self,
+        scope: Scope,
+        status_code: int,
+        duration: float,
+        body: bytes,
+        body_size: int,
+    ) -> None:
+        data: dict[str, Any] = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "duration": round(duration, 5),
+        }
+        if query := scope["query_string"].decode("latin-1"):
+            data["query"] = query
+
+        if body_size:
+            content_type: str = ""
+            for name, value in scope["headers"]:
+                if name == b"content-type":
+                    content_type = value.decode("latin-1")
+                    break
+
+            data["body_size"] = body_size
+            data["content_type"] = content_type
+            if content_type.startswith("application/json"):
+                data["body"] = body.decode("utf-8", errors="replace")
+                data["body_truncated"] = body_size > len(body)
+
+        self.sink.log("request", data)
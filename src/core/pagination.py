@@ -1,13 +1,102 @@
-from typing import Type, Generic, Any
+import base64
+import binascii
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from functools import cache
+from typing import Type, Generic, Any, Literal, Sequence, ClassVar
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import Select
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ClauseElement, Executable, Select
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.visitors import InternalTraversal
 import sqlalchemy as sa
 
-from src.core.schemas import PaginatedResponseSchema, PaginationItem
+from src.core.repositories.exceptions import InvalidCursorError
+from src.core.repositories.sqla.projection import is_entity_select, list_adapter
+from src.db.unit_of_work import session_scope
+from src.db.utils import quote_table_name
+from src.core.schemas import (
+    PaginatedResponseSchema,
+    PaginationItem,
+    CursorPaginatedResponseSchema,
+)
+
+
+CursorDirection = Literal["next", "prev"]
+KeysetColumns = Sequence[InstrumentedAttribute[Any]]
+# exact    - separate `SELECT count(*)` over the statement
+# window   - `count(*) OVER ()` next to the page rows, single round trip
+# estimate - planner row estimate, exact count only for small results
+# cached   - exact count cached per statement for `count_cache_ttl` seconds
+CountStrategy = Literal["exact", "window", "estimate", "cached"]
+
+# statement hash -> (expires at, count), shared by all paginators of a process
+_count_cache: OrderedDict[str, tuple[float, int]] = OrderedDict()
+
+
+class _Explain(Executable, ClauseElement):
+    """
+    `EXPLAIN (FORMAT JSON)` of a statement, compiled with its bind
+    parameters, so that filter values are never inlined into the SQL.
+    """
+
+    inherit_cache = True
+    _traverse_internals = [("statement", InternalTraversal.dp_clauseelement)]
+
+    def __init__(self, statement: Select[tuple[Any]]) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain)
+def _compile_explain(element: _Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+class _Cursor(BaseModel):
+    d: CursorDirection
+    v: list[Any]
+
+
+@cache
+def _type_adapter(python_type: type[Any]) -> TypeAdapter[Any]:
+    return TypeAdapter(python_type)
+
+
+def encode_cursor(direction: CursorDirection, values: Sequence[Any]) -> str:
+    payload = _Cursor(d=direction, v=list(values)).model_dump_json()
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, keyset: KeysetColumns
+) -> tuple[CursorDirection, list[Any]]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        decoded = _Cursor.model_validate_json(payload)
+        if len(decoded.v) != len(keyset):
+            raise ValueError("keyset length mismatch")
+
+        values = [
+            _type_adapter(column.type.python_type).validate_python(value)
+            for column, value in zip(keyset, decoded.v)
+        ]
+    except (binascii.Error, ValueError, ValidationError, NotImplementedError) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {cursor}") from e
+
+    return decoded.d, values
 
 
 class SQLAlchemyModelPaginator(Generic[PaginationItem]):
     pagination_item_type: Type[PaginationItem]
+    count_strategy: ClassVar[CountStrategy] = "exact"
+    estimate_threshold: ClassVar[int] = 100_000
+    count_cache_ttl: ClassVar[float] = 60.0
+    count_cache_size: ClassVar[int] = 1024
 
     def __init__(
         self,
@@ -16,26 +105,236 @@ class SQLAlchemyModelPaginator(Generic[PaginationItem]):
         self.session = session
 
     async def get_list(
-        self, statement: Select[tuple[Any]], page: int, page_size: int
+        self,
+        statement: Select[tuple[Any]],
+        page: int,
+        page_size: int,
+        count_strategy: CountStrategy | None = None,
+        item_type: Type[PaginationItem] | None = None,
     ) -> PaginatedResponseSchema[PaginationItem]:
+        """
+        `statement` may select a model entity or columns. Items are validated
+        as `item_type` (`pagination_item_type` by default).
+        """
+        strategy = count_strategy or self.count_strategy
         offset = (page - 1) * page_size
+        statement_items = statement.limit(page_size).offset(offset)
+        is_exact = True
 
-        async with self.session as s:
-            count = (
-                await s.execute(
-                    sa.select(sa.func.count()).select_from(statement.subquery())
+        async with session_scope(self.session) as s:
+            if strategy == "window":
+                total = sa.func.count().over().label("pagination_total_count")
+                rows = (await s.execute(statement_items.add_columns(total))).all()
+                # The extra column is ignored when projected rows are validated
+                models: Sequence[Any] = (
+                    [row[0] for row in rows] if is_entity_select(statement) else rows
                 )
-            ).scalar_one()
+                if rows:
+                    count = rows[0][-1]
+                elif page == 1:
+                    count = 0
+                else:
+                    # Past the last page there is no row to carry the count
+                    count = await self._exact_count(s, statement)
+            else:
+                if strategy == "estimate":
+                    count, is_exact = await self._estimated_count(s, statement)
+                elif strategy == "cached":
+                    count = await self._cached_count(s, statement)
+                else:
+                    count = await self._exact_count(s, statement)
 
-            statement_items = statement.limit(page_size).offset(offset)
-            models = (await s.execute(statement_items)).scalars().all()
+                models = await self._fetch(s, statement_items)
 
         total_pages = (count + page_size - 1) // page_size
 
-        return PaginatedResponseSchema(
+        # Parametrized, so that the page is an exact instance of the route's
+        # response model and PydanticJSONRoute can skip revalidating it
+        item_type = item_type or self.pagination_item_type
+        return PaginatedResponseSchema[item_type](  # type: ignore[valid-type]
             page=page,
             page_size=page_size,
             total_pages=total_pages,
             total_items=count,
-            items=[self.pagination_item_type.model_validate(model) for model in models],
+            count_type="exact" if is_exact else "estimated",
+            items=self._validate_items(models, item_type),
+        )
+
+    async def count(
+        self,
+        statement: Select[tuple[Any]],
+        count_strategy: CountStrategy | None = None,
+    ) -> tuple[int, bool]:
+        """
+        Rows of `statement` counted the way `get_list` counts them, and
+        whether the count is exact. `window` counts exactly, as there is no
+        page query to add the count to.
+        """
+        strategy = count_strategy or self.count_strategy
+        async with session_scope(self.session) as s:
+            if strategy == "estimate":
+                return await self._estimated_count(s, statement)
+            if strategy == "cached":
+                return await self._cached_count(s, statement), True
+
+            return await self._exact_count(s, statement), True
+
+    @staticmethod
+    async def _fetch(
+        session: AsyncSession, statement: Select[tuple[Any]]
+    ) -> Sequence[Any]:
+        """
+        ORM entities, or plain rows when `statement` selects columns.
+        """
+        result = await session.execute(statement)
+        rows: Sequence[Any] = (
+            result.scalars().all() if is_entity_select(statement) else result.all()
         )
+        return rows
+
+    @staticmethod
+    def _validate_items(
+        models: Sequence[Any], item_type: Type[PaginationItem]
+    ) -> list[PaginationItem]:
+        items: list[PaginationItem] = list_adapter(item_type).validate_python(
+            models, from_attributes=True
+        )
+        return items
+
+    @staticmethod
+    async def _exact_count(session: AsyncSession, statement: Select[tuple[Any]]) -> int:
+        count: int = (
+            await session.execute(
+                sa.select(sa.func.count()).select_from(statement.subquery())
+            )
+        ).scalar_one()
+        return count
+
+    async def _cached_count(
+        self, session: AsyncSession, statement: Select[tuple[Any]]
+    ) -> int:
+        compiled = statement.compile(dialect=session.get_bind().dialect)
+        key = hashlib.blake2b(
+            f"{compiled}|{sorted(compiled.params.items())!r}".encode(), digest_size=16
+        ).hexdigest()
+
+        now = time.monotonic()
+        cached = _count_cache.get(key)
+        if cached is not None and cached[0] > now:
+            _count_cache.move_to_end(key)
+            return cached[1]
+
+        count = await self._exact_count(session, statement)
+        _count_cache[key] = (now + self.count_cache_ttl, count)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > self.count_cache_size:
+            _count_cache.popitem(last=False)
+
+        return count
+
+    async def _estimated_count(
+        self, session: AsyncSession, statement: Select[tuple[Any]]
+    ) -> tuple[int, bool]:
+        """
+        Uses `pg_class.reltuples` for a bare table scan and the `EXPLAIN` row
+        estimate otherwise. Estimates below `estimate_threshold` are replaced
+        with an exact count, which is cheap at that size.
+        """
+        dialect = session.get_bind().dialect
+        froms = statement.get_final_froms()
+        estimate: int | None = None
+
+        if (
+            statement.whereclause is None
+            and not statement._group_by_clauses
+            and not statement._distinct
+            and len(froms) == 1
+            and isinstance(froms[0], sa.Table)
+        ):
+            estimate = (
+                await session.execute(
+                    sa.text(
+                        "SELECT reltuples::bigint FROM pg_class "
+                        "WHERE oid = to_regclass(:table_name)"
+                    ),
+                    {"table_name": quote_table_name(froms[0], dialect)},
+                )
+            ).scalar_one_or_none()
+        else:
+            connection = await session.connection()
+            plan = (await connection.execute(_Explain(statement))).scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+
+        # reltuples is -1 for tables that were never vacuumed or analyzed
+        if estimate is None or estimate < self.estimate_threshold:
+            return await self._exact_count(session, statement), True
+
+        return estimate, False
+
+    async def get_cursor_list(
+        self,
+        statement: Select[tuple[Any]],
+        cursor: str | None,
+        page_size: int,
+        keyset: KeysetColumns,
+        item_type: Type[PaginationItem] | None = None,
+    ) -> CursorPaginatedResponseSchema[PaginationItem]:
+        """
+        Keyset pagination: instead of skipping `offset` rows, the page starts
+        right after (or before) the row the cursor points to, so deep pages
+        cost the same as the first one as long as `keyset` is indexed.
+        The last column of `keyset` must be unique (e.g. the primary key),
+        and a `statement` selecting columns must include all of `keyset`.
+        """
+        direction: CursorDirection = "next"
+        values: list[Any] | None = None
+        if cursor is not None:
+            direction, values = decode_cursor(cursor, keyset)
+
+        statement = statement.order_by(None)
+        if values is not None:
+            row = sa.tuple_(*keyset)
+            bound = sa.tuple_(
+                *(
+                    sa.literal(value, column.type)
+                    for column, value in zip(keyset, values)
+                )
+            )
+            statement = statement.where(
+                row > bound if direction == "next" else row < bound
+            )
+
+        if direction == "next":
+            statement = statement.order_by(*(column.asc() for column in keyset))
+        else:
+            statement = statement.order_by(*(column.desc() for column in keyset))
+
+        async with session_scope(self.session) as s:
+            models = list(await self._fetch(s, statement.limit(page_size + 1)))
+
+        has_more = len(models) > page_size
+        models = models[:page_size]
+        if direction == "prev":
+            models.reverse()
+
+        first = self._keyset_values(models[0], keyset) if models else values
+        last = self._keyset_values(models[-1], keyset) if models else values
+
+        if direction == "next":
+            has_next, has_prev = has_more, values is not None
+        else:
+            has_next, has_prev = values is not None, has_more
+
+        item_type = item_type or self.pagination_item_type
+        return CursorPaginatedResponseSchema[item_type](  # type: ignore[valid-type]
+            page_size=page_size,
+            next_cursor=encode_cursor("next", last) if has_next and last else None,
+            prev_cursor=encode_cursor("prev", first) if has_prev and first else None,
+            items=self._validate_items(models, item_type),
+        )
+
+    @staticmethod
+    def _keyset_values(model: Any, keyset: KeysetColumns) -> list[Any]:
+        return [getattr(model, column.key) for column in keyset]
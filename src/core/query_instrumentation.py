@@ -0,0 +1,137 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Mapping, Self
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection, Engine, ExecutionContext
+from starlette.types import Scope
+
+from src.core.log_sink import JSONLinesLogSink
+from src.core.metrics import DB_STATEMENT_DURATION, current_repository_method
+
+
+class QueryStats:
+    """
+    Statements executed while handling one request.
+    """
+
+    def __init__(self: Self, scope: Scope | None = None) -> None:
+        self.scope = scope
+        self.count: int = 0
+        self.duration: float = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    @property
+    def route(self: Self) -> str | None:
+        if self.scope is None:
+            return None
+
+        # Set by the router once the request is matched
+        route_path: str | None = getattr(self.scope.get("route"), "path", None)
+        return route_path
+
+    def add(self: Self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement] += 1
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+class QueryInstrumentation:
+    """
+    Times every statement of the instrumented engines and tags it with the
+    route and repository method that issued it.
+
+    Statements slower than `slow_query_threshold` seconds are written to
+    `sink` with parameter values replaced by their type names. Statements
+    (compared as SQL with placeholders) executed more than
+    `n_plus_one_threshold` times within one request are reported by
+    `check_request` as a likely N+1.
+    """
+
+    def __init__(
+        self: Self,
+        sink: JSONLinesLogSink,
+        slow_query_threshold: float = 0.5,
+        n_plus_one_threshold: int = 10,
+    ) -> None:
+        self.sink = sink
+        self.slow_query_threshold = slow_query_threshold
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    def instrument(self: Self, engine: Engine) -> None:
+        sa.event.listen(engine, "before_cursor_execute", self._before_execute)
+        sa.event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def check_request(self: Self, stats: QueryStats) -> None:
+        for statement, count in stats.shapes.items():
+            if count > self.n_plus_one_threshold:
+                self.sink.log(
+                    "n_plus_one",
+                    {
+                        "route": stats.route,
+                        "statement": statement,
+                        "executions": count,
+                        "request_queries": stats.count,
+                    },
+                )
+
+    def _before_execute(
+        self: Self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        # A connection runs one statement at a time
+        conn.info["query_started_at"] = time.perf_counter()
+
+    def _after_execute(
+        self: Self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        duration = time.perf_counter() - conn.info["query_started_at"]
+        repository_method = current_repository_method.get()
+        stats = current_query_stats.get()
+        route = None
+        if stats is not None:
+            stats.add(statement, duration)
+            route = stats.route
+
+        DB_STATEMENT_DURATION.labels(route or "", repository_method or "").observe(
+            duration
+        )
+
+        if duration >= self.slow_query_threshold:
+            self.sink.log(
+                "slow_query",
+                {
+                    "duration": round(duration, 5),
+                    "route": route,
+                    "repository_method": repository_method,
+                    "statement": statement,
+                    "parameters": self._redact(parameters, executemany),
+                },
+            )
+
+    @staticmethod
+    def _redact(parameters: Any, executemany: bool) -> Any:
+        if executemany:
+            return f"<{len(parameters)} parameter sets>"
+
+        if isinstance(parameters, Mapping):
+            return {key: type(value).__name__ for key, value in parameters.items()}
+
+        return [type(value).__name__ for value in parameters or ()]
@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, Iterable, Self, TypeVar
+
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class LRUTTLCache(Generic[KeyType, ValueType]):
+    """
+    In-process LRU cache with a per-entry TTL and a size bound.
+
+    Every gunicorn worker holds its own copy and writes only invalidate the
+    copy of the worker that made them, so `ttl` is the upper bound of how
+    stale a value read through another worker can be.
+
+    A read that races with a write could store its old value after the
+    write's invalidation. Readers take a `generation()` before reading and
+    pass it to `set`, which drops the value if the key was invalidated since.
+    Readers of a lagging replica also pass the lag bound as `settle`, so that
+    values of keys invalidated more recently than that aren't stored.
+    """
+
+    def __init__(self: Self, maxsize: int = 1024, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: OrderedDict[KeyType, tuple[float, ValueType]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        # Generation and time of the last invalidation of recently invalidated
+        # keys, and the latest ones of the keys dropped from it to stay bounded
+        self._invalidated: OrderedDict[KeyType, tuple[int, float]] = OrderedDict()
+        self._forgotten: tuple[int, float] = (0, float("-inf"))
+
+    def __len__(self: Self) -> int:
+        return len(self._data)
+
+    def get(self: Self, key: KeyType) -> ValueType | None:
+        with self._lock:
+            return self._get(key, time.monotonic())
+
+    def get_many(self: Self, keys: Iterable[KeyType]) -> dict[KeyType, ValueType]:
+        now = time.monotonic()
+        result: dict[KeyType, ValueType] = {}
+        with self._lock:
+            for key in keys:
+                value = self._get(key, now)
+                if value is not None:
+                    result[key] = value
+
+        return result
+
+    def generation(self: Self) -> int:
+        return self._generation
+
+    def set(
+        self: Self,
+        key: KeyType,
+        value: ValueType,
+        generation: int | None = None,
+        settle: float = 0.0,
+    ) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if not self._invalidated_since(key, generation, now - settle):
+                self._set(key, value, now + self.ttl)
+
+    def set_many(
+        self: Self,
+        items: Iterable[tuple[KeyType, ValueType]],
+        generation: int | None = None,
+        settle: float = 0.0,
+    ) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for key, value in items:
+                if not self._invalidated_since(key, generation, now - settle):
+                    self._set(key, value, now + self.ttl)
+
+    def invalidate(self: Self, key: KeyType) -> None:
+        with self._lock:
+            self._invalidate(key)
+
+    def invalidate_many(self: Self, keys: Iterable[KeyType]) -> None:
+        with self._lock:
+            for key in keys:
+                self._invalidate(key)
+
+    def clear(self: Self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+            self._invalidated.clear()
+            self._forgotten = (self._generation, time.monotonic())
+
+    def _get(self: Self, key: KeyType, now: float) -> ValueType | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def _invalidate(self: Self, key: KeyType) -> None:
+        self._data.pop(key, None)
+        self._generation += 1
+        self._invalidated[key] = (self._generation, time.monotonic())
+        self._invalidated.move_to_end(key)
+        while len(self._invalidated) > self.maxsize:
+            _, self._forgotten = self._invalidated.popitem(last=False)
+
+    def _invalidated_since(
+        self: Self, key: KeyType, generation: int | None, since: float
+    ) -> bool:
+        invalidated_generation, invalidated_at = self._invalidated.get(
+            key, self._forgotten
+        )
+        return invalidated_at > since or (
+            generation is not None and invalidated_generation > generation
+        )
+
+    def _set(self: Self, key: KeyType, value: ValueType, expires_at: float) -> None:
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
@@ -1,2 +1,18 @@
 class RepositoryException(Exception):
     """Base repository exception"""
+
+
+class InvalidCursorError(RepositoryException):
+    """Pagination cursor is malformed or does not match the keyset"""
+
+
+class InvalidFieldsError(RepositoryException):
+    """Requested fields are not columns of the read schema"""
+
+
+class InvalidQuerySpecError(RepositoryException):
+    """Filter or sort on a column that isn't allowed, or a value of a wrong type"""
+
+
+class InvalidConflictColumnsError(RepositoryException):
+    """Upsert conflict target isn't a unique key the rows provide"""
@@ -0,0 +1,144 @@
+import asyncio
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generic, Self
+from uuid import UUID
+
+from src.core.repositories.sqla.base_repository import (
+    BaseSQLAlchemyRepositoryImpl,
+    ReadSchemaType,
+)
+from src.core.repositories.sqla.exceptions import SQLARepositoryObjectNotFoundError
+from src.db.db_service import db_service
+
+
+RepositoryType = type[BaseSQLAlchemyRepositoryImpl[Any, ReadSchemaType, Any, Any]]
+
+
+class RepositoryLoader(Generic[ReadSchemaType]):
+    """
+    Request-scoped batching loader on top of a repository.
+
+    Ids requested during the same event loop iteration (e.g. from several
+    `asyncio.gather` branches) are fetched with a single `get_by_ids` call,
+    and every id is fetched at most once per loader. Read schemas must have
+    an `id` field.
+    """
+
+    def __init__(
+        self: Self,
+        repository: BaseSQLAlchemyRepositoryImpl[Any, ReadSchemaType, Any, Any],
+    ) -> None:
+        self.repository = repository
+        self._futures: dict[UUID, asyncio.Future[ReadSchemaType | None]] = {}
+        self._pending: list[tuple[UUID, asyncio.Future[ReadSchemaType | None]]] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+        # Batches share the repository session, which can't run them concurrently
+        self._lock = asyncio.Lock()
+
+    async def get(self: Self, id: UUID) -> ReadSchemaType:
+        item = await self.load(id)
+        if item is None:
+            raise SQLARepositoryObjectNotFoundError(
+                f"{self.repository.model_type.__name__} with id: {id} not found"
+            )
+
+        return item
+
+    async def get_or_none(self: Self, id: UUID) -> ReadSchemaType | None:
+        return await self.load(id)
+
+    async def get_by_ids(self: Self, ids: list[UUID]) -> list[ReadSchemaType]:
+        items = await asyncio.gather(*(self.load(id) for id in ids))
+        return [item for item in items if item is not None]
+
+    def load(self: Self, id: UUID) -> Awaitable[ReadSchemaType | None]:
+        # The id is queued right away, so that ids loaded within the same
+        # event loop iteration share a batch even before they are awaited
+        return self._wait(self._future(id))
+
+    @staticmethod
+    async def _wait(
+        future: asyncio.Future[ReadSchemaType | None],
+    ) -> ReadSchemaType | None:
+        # A cancelled caller must not cancel the future other callers share
+        return await asyncio.shield(future)
+
+    def _future(self: Self, id: UUID) -> asyncio.Future[ReadSchemaType | None]:
+        future = self._futures.get(id)
+        if future is not None and not future.cancelled():
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[id] = future
+        if not self._pending:
+            loop.call_soon(self._dispatch)
+        self._pending.append((id, future))
+
+        return future
+
+    def prime(self: Self, item: ReadSchemaType) -> None:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(item)
+        self._futures[item.id] = future  # type: ignore[attr-defined]
+
+    def clear(self: Self, id: UUID | None = None) -> None:
+        if id is None:
+            self._futures.clear()
+        else:
+            self._futures.pop(id, None)
+
+    def _dispatch(self: Self) -> None:
+        # The batch resolves the futures it was dispatched with, so clear and
+        # prime only affect later loads, not callers already waiting
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._load_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(
+        self: Self, batch: list[tuple[UUID, asyncio.Future[ReadSchemaType | None]]]
+    ) -> None:
+        try:
+            async with self._lock:
+                items = await self.repository.get_by_ids([id for id, _ in batch])
+        except Exception as e:
+            for id, future in batch:
+                # Forget failed ids so that a later load retries them
+                if self._futures.get(id) is future:
+                    del self._futures[id]
+                if not future.done():
+                    future.set_exception(e)
+                    # Loads that are never awaited must not log the error
+                    future.exception()
+            return
+
+        items_by_id = {item.id: item for item in items}  # type: ignore[attr-defined]
+        for id, future in batch:
+            if not future.done():
+                future.set_result(items_by_id.get(id))
+
+
+_loader_dependencies: dict[type[Any], Callable[..., Any]] = {}
+
+
+def get_loader(
+    repository_type: RepositoryType[ReadSchemaType],
+) -> Callable[[], AsyncGenerator[RepositoryLoader[ReadSchemaType], None]]:
+    """
+    FastAPI dependency factory, e.g.
+    `loader: Annotated[RepositoryLoader[UserSchema], Depends(get_loader(UserRepo))]`.
+    The same dependency callable is returned for a repository type, so FastAPI
+    resolves it once per request and all consumers share one loader.
+    """
+    dependency = _loader_dependencies.get(repository_type)
+    if dependency is None:
+
+        async def dependency() -> AsyncGenerator[
+            RepositoryLoader[ReadSchemaType], None
+        ]:
+            async with db_service.read_session_factory() as session:
+                yield RepositoryLoader(repository_type(session))
+
+        _loader_dependencies[repository_type] = dependency
+
+    return dependency
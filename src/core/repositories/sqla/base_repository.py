@@ -1,20 +1,73 @@
+import asyncio
 import contextlib
-from uuid import UUID
-from typing import TypeVar, Protocol, Self, Type, Generic, NoReturn
+from itertools import batched
+from uuid import UUID, uuid4
+from typing import (
+    TypeVar,
+    Protocol,
+    Self,
+    Type,
+    Generic,
+    NoReturn,
+    ClassVar,
+    Any,
+    AsyncIterator,
+    Sequence,
+    cast,
+    overload,
+)
 
+import asyncpg
 import sqlalchemy as sa
 from pydantic import BaseModel
+from sqlalchemy.engine import Result
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
+from src.core.config import settings
+from src.core.deadlines import DeadlineExceededError
+from src.core.metrics import timed_repository_method
 from src.core.pagination import SQLAlchemyModelPaginator
-from src.core.repositories.exceptions import RepositoryException
+from src.core.repositories.cache import LRUTTLCache
+from src.core.repositories.exceptions import (
+    InvalidConflictColumnsError,
+    InvalidQuerySpecError,
+    RepositoryException,
+)
+from src.core.repositories.sqla import statements
+from src.core.repositories.sqla.projection import (
+    is_entity_select,
+    list_adapter,
+    partial_schema,
+    projection_columns,
+)
+from src.core.responses import weak_etag
+from src.core.repositories.sqla.query_spec import (
+    apply_query_spec,
+    check_indexed,
+    check_prefix_indexed,
+    unique_keys,
+)
 from src.core.repositories.sqla.exceptions import (
     SQLARepositoryObjectNotFoundError,
     BaseSQLAlRepositoryException,
 )
-from src.core.schemas import UpdateBaseModel, PaginationSchema, PaginatedResponseSchema
-from src.core.utils.exceptions import ModelObjectNotFoundException
+from src.core.schemas import (
+    UpdateBaseModel,
+    PaginationSchema,
+    PaginatedResponseSchema,
+    CursorPaginationSchema,
+    CursorPaginatedResponseSchema,
+    QuerySpecSchema,
+)
 from src.db.base import Base
+from src.db.unit_of_work import (
+    current_unit_of_work,
+    on_commit,
+    session_scope,
+    transaction,
+)
+from src.db.utils import quote_table_name
 from sqlalchemy.exc import (
     OperationalError,
     IntegrityError,
@@ -37,6 +90,9 @@ from src.core.repositories.sqla.exceptions import (
 )
 
 
+# statement_timeout, or a cancel request
+QUERY_CANCELED_SQLSTATE = "57014"
+
 ModelType = TypeVar("ModelType", bound=Base, covariant=True)
 ReadSchemaType = TypeVar("ReadSchemaType", bound=BaseModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -62,13 +118,21 @@ class SQLAlchemyBaseRepositoryProtocol(
         self: Self, create_objects: list[CreateSchemaType]
     ) -> list[ReadSchemaType] | NoReturn: ...
 
+    async def bulk_upsert(
+        self: Self,
+        data: list[CreateSchemaType],
+        conflict_columns: Sequence[str] | None = None,
+        update_columns: Sequence[str] | None = None,
+        concurrency: int = 1,
+    ) -> list[ReadSchemaType] | NoReturn: ...
+
     async def update(
         self: Self, update_object: UpdateSchemaType
     ) -> ReadSchemaType | NoReturn: ...
 
     async def bulk_update(
         self: Self, update_objects: list[UpdateSchemaType]
-    ) -> None | NoReturn: ...
+    ) -> list[ReadSchemaType] | NoReturn: ...
 
     async def delete(self: Self, id: UUID) -> bool: ...
 
@@ -78,73 +142,147 @@ class BaseSQLAlchemyRepositoryImpl(
 ):
     model_type: Type[ModelType]
     read_schema_type: Type[ReadSchemaType]
+    # Columns used by cursor pagination, the last one must be unique. With
+    # uuid7 keys ("id",) pages in creation order through the primary key alone.
+    cursor_columns: ClassVar[tuple[str, ...]] = ("created_at", "id")
+    # Optional read-through cache of read schemas by primary key, shared by all
+    # instances of the repository. Cached schemas are shared objects and must
+    # not be mutated, so read schemas of cached repositories should be frozen.
+    cache: LRUTTLCache[UUID, ReadSchemaType] | None = None
+    # bulk_create switches to COPY (see bulk_ingest) from this many rows
+    copy_threshold: ClassVar[int] = 5_000
+    copy_chunk_size: ClassVar[int] = 10_000
+    # Read only the columns of read_schema_type as plain rows instead of ORM
+    # entities. Every read schema field must then be a model column.
+    projection: ClassVar[bool] = False
+    # Columns clients may filter and sort get_all_paginated by. Each must lead
+    # an index of the table, which is checked when the repository is defined.
+    filterable_columns: ClassVar[tuple[str, ...]] = ()
+    sortable_columns: ClassVar[tuple[str, ...]] = ()
+    # Filterable columns that may also be filtered by prefix. Each must lead
+    # an index with `postgresql_ops={column: "text_pattern_ops"}` or have the
+    # "C" collation, otherwise LIKE 'prefix%' can't use the index.
+    prefix_columns: ClassVar[tuple[str, ...]] = ()
+    # Column the ETags of get_etag and get_list_etag are derived from
+    etag_column: ClassVar[str] = "updated_at"
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Generic intermediate repositories have no model yet
+        model_type = getattr(cls, "model_type", None)
+        if model_type is not None:
+            check_indexed(
+                model_type,
+                tuple(dict.fromkeys((*cls.filterable_columns, *cls.sortable_columns))),
+            )
+            check_prefix_indexed(model_type, cls.prefix_columns)
 
-    def __init__(self: Self, session: AsyncSession):
+    def __init__(
+        self: Self, session: AsyncSession, read_session: AsyncSession | None = None
+    ):
         self.session = session
+        # Reads may go to a replica (see DataBaseService.get_read_session)
+        self.read_session = read_session if read_session is not None else session
 
-    async def get(self: Self, id: UUID) -> ReadSchemaType | NoReturn:
+    @timed_repository_method
+    async def get(
+        self: Self, id: UUID, fields: Sequence[str] | None = None
+    ) -> ReadSchemaType | NoReturn:
         try:
-            async with self.session as session:
-                stmt = sa.select(self.model_type).where(self.model_type.id == id)
-                item = (await session.execute(stmt)).scalar_one_or_none()
-                if item is None:
+            # Cached schemas are full ones, so partial reads bypass the cache
+            cache = self._read_cache if fields is None else None
+            if cache is not None and (cached := cache.get(id)) is not None:
+                return cached
+
+            # Taken before the read, so a write committed meanwhile wins
+            generation = cache.generation() if cache is not None else None
+            columns, schema_type = self._projection(fields)
+            async with session_scope(self.read_session) as session:
+                stmt = statements.select_by_id(self.model_type, columns)
+                result = await session.execute(stmt, {"id": id})
+                items = self._validate_result(result, columns, schema_type)
+                if not items:
                     raise SQLARepositoryObjectNotFoundError(
                         f"{self.model_type.__name__} with id: {id} not found"
                     )
 
-                return self.read_schema_type.model_validate(item, from_attributes=True)
+            if cache is not None:
+                cache.set(id, items[0], generation, settle=self._replica_lag)
+
+            return items[0]
         except Exception as e:
             self.handle_errors(e)
 
+    @timed_repository_method
     async def get_or_none(self: Self, id: UUID) -> ReadSchemaType | None | NoReturn:
         try:
-            with contextlib.suppress(ModelObjectNotFoundException):
+            with contextlib.suppress(SQLARepositoryObjectNotFoundError):
                 return await self.get(id)
 
             return None
         except Exception as e:
             self.handle_errors(e)
 
+    @timed_repository_method
     async def get_by_ids(
-        self: Self, ids: list[UUID]
+        self: Self, ids: list[UUID], fields: Sequence[str] | None = None
     ) -> list[ReadSchemaType] | NoReturn:
         try:
-            async with self.session as session:
-                stmt = sa.select(self.model_type).where(self.model_type.id.in_(ids))
-                items = (await session.execute(stmt)).scalars().all()
+            unique_ids = list(dict.fromkeys(ids))
+            # Cached schemas are full ones, so partial reads bypass the cache
+            cache = self._read_cache if fields is None else None
+            found = cache.get_many(unique_ids) if cache is not None else {}
+            missing = [id for id in unique_ids if id not in found]
+            generation = cache.generation() if cache is not None else None
+
+            if missing:
+                columns, schema_type = self._projection(fields, required=("id",))
+                async with session_scope(self.read_session) as session:
+                    stmt = statements.select_by_ids(self.model_type, columns)
+                    result = await session.execute(stmt, {"ids": missing})
+                    fetched = {
+                        item.id: item  # type: ignore[attr-defined]
+                        for item in self._validate_result(result, columns, schema_type)
+                    }
+
+                if cache is not None:
+                    cache.set_many(
+                        fetched.items(), generation, settle=self._replica_lag
+                    )
+                found.update(fetched)
 
-                return [
-                    self.read_schema_type.model_validate(item, from_attributes=True)
-                    for item in items
-                ]
+            return [found[id] for id in unique_ids if id in found]
         except Exception as e:
             self.handle_errors(e)
 
+    @timed_repository_method
     async def create(self: Self, data: CreateSchemaType) -> ReadSchemaType | NoReturn:
         try:
-            async with self.session as session:
+            async with transaction(self.session) as session:
                 stmt = (
                     sa.insert(self.model_type)
                     .values(**data.model_dump(exclude={"id"}))
                     .returning(self.model_type)
                 )
                 item = (await session.execute(stmt)).scalar_one()
-                await session.commit()
 
                 return self.read_schema_type.model_validate(item, from_attributes=True)
         except Exception as e:
             self.handle_errors(e)
 
+    @timed_repository_method
     async def bulk_create(
         self: Self, data: list[CreateSchemaType]
     ) -> list[ReadSchemaType] | NoReturn:
+        if len(data) >= self.copy_threshold:
+            return await self.bulk_ingest(data)
+
         try:
-            async with self.session as session:
+            async with transaction(self.session) as session:
                 stmt = sa.insert(self.model_type).returning(self.model_type)
                 items = (
                     await session.scalars(stmt, [x.model_dump() for x in data])
                 ).all()
-                await session.commit()
 
                 return [
                     self.read_schema_type.model_validate(item, from_attributes=True)
@@ -153,73 +291,654 @@ class BaseSQLAlchemyRepositoryImpl(
         except Exception as e:
             self.handle_errors(e)
 
-    async def update(self: Self, data: UpdateSchemaType) -> ReadSchemaType | NoReturn:
+    @timed_repository_method
+    async def bulk_ingest(
+        self: Self, data: list[CreateSchemaType], returning: bool = True
+    ) -> list[ReadSchemaType] | NoReturn:
+        """
+        Inserts rows with binary COPY in chunks of `copy_chunk_size`.
+
+        With `returning`, rows are copied into a temporary staging table and
+        moved with a single `INSERT ... SELECT ... RETURNING`, so server side
+        values like `created_at` come back. Otherwise they are copied straight
+        into the table and an empty list is returned.
+        """
+        if not data:
+            return []
+
         try:
-            async with self.session as session:
-                pk = data.id
+            async with transaction(self.session) as session:
+                connection = await session.connection()
+                table = cast(sa.Table, self.model_type.__table__)
+                columns, records = self._copy_records(data, connection.dialect)
+                raw_connection = await connection.get_raw_connection()
+                driver_connection: asyncpg.Connection = raw_connection.driver_connection
+
+                if not returning:
+                    # The asyncpg adapter sends BEGIN with the first statement,
+                    # so run one before the raw COPY. Otherwise the COPY's
+                    # transaction would be the top-level one and commit on its
+                    # own, outside of the session or unit of work.
+                    await connection.exec_driver_sql("SELECT 1")
+                    # A savepoint now, so a failed COPY leaves the session usable
+                    async with driver_connection.transaction():
+                        for chunk in batched(records, self.copy_chunk_size):
+                            await driver_connection.copy_records_to_table(
+                                table.name,
+                                records=chunk,
+                                columns=columns,
+                                schema_name=table.schema,
+                            )
+
+                    return []
+
+                staging_name = f"_staging_{uuid4().hex}"
+                await connection.execute(
+                    sa.text(
+                        f'CREATE TEMPORARY TABLE "{staging_name}" '
+                        f"(LIKE {quote_table_name(table, connection.dialect)} "
+                        "INCLUDING DEFAULTS) ON COMMIT DROP"
+                    )
+                )
+                for chunk in batched(records, self.copy_chunk_size):
+                    await driver_connection.copy_records_to_table(
+                        staging_name, records=chunk, columns=columns
+                    )
+
+                staging = sa.table(staging_name, *(sa.column(c) for c in columns))
                 stmt = (
-                    sa.update(self.model_type)
-                    .where(self.model_type.id == pk)
-                    .values(data.model_dump(exclude={"id"}, exclude_unset=True))
+                    sa.insert(self.model_type)
+                    .from_select(columns, sa.select(*staging.c))
+                    .returning(self.model_type)
                 )
-                item = (await session.execute(stmt)).scalar_one()
-                await session.commit()
+                items = (await session.scalars(stmt)).all()
 
-                return self.read_schema_type.model_validate(item, from_attributes=True)
+                return [
+                    self.read_schema_type.model_validate(item, from_attributes=True)
+                    for item in items
+                ]
+        except asyncpg.QueryCanceledError as e:
+            self.handle_errors(SQLARepositoryTimeoutError(str(e)))
+        except asyncpg.IntegrityConstraintViolationError as e:
+            self.handle_errors(SQLARepositoryIntegrityError(str(e)))
+        except asyncpg.DataError as e:
+            self.handle_errors(SQLARepositoryDataError(str(e)))
+        except asyncpg.PostgresError as e:
+            self.handle_errors(SQLARepositoryQueryError(str(e)))
         except Exception as e:
             self.handle_errors(e)
 
+    def _copy_records(
+        self: Self, data: list[CreateSchemaType], dialect: sa.Dialect
+    ) -> tuple[list[str], list[tuple[Any, ...]]]:
+        """
+        COPY bypasses SQLAlchemy, so values go through the column bind
+        processors here, and Python side column defaults (e.g. `id`) are
+        generated for columns missing from the create schema.
+        """
+        table = cast(sa.Table, self.model_type.__table__)
+        rows = [x.model_dump() for x in data]
+        columns = [c for c in rows[0] if c in table.c]
+        defaults = [
+            c.name
+            for c in table.c
+            if c.name not in columns
+            and c.default is not None
+            and (c.default.is_callable or c.default.is_scalar)
+        ]
+        processors = [
+            table.c[name].type.bind_processor(dialect) for name in columns + defaults
+        ]
+
+        records: list[tuple[Any, ...]] = []
+        for row in rows:
+            values = [row[name] for name in columns]
+            for name in defaults:
+                default = cast(sa.ColumnDefault, table.c[name].default)
+                values.append(default.arg(None) if default.is_callable else default.arg)
+            records.append(
+                tuple(
+                    processor(value) if processor is not None else value
+                    for processor, value in zip(processors, values)
+                )
+            )
+
+        return columns + defaults, records
+
+    @timed_repository_method
+    async def bulk_upsert(
+        self: Self,
+        data: list[CreateSchemaType],
+        conflict_columns: Sequence[str] | None = None,
+        update_columns: Sequence[str] | None = None,
+        concurrency: int = 1,
+    ) -> list[ReadSchemaType] | NoReturn:
+        """
+        Inserts rows, updating `update_columns` (by default every other given
+        column) of the ones that conflict on `conflict_columns`, which must
+        be a unique key of the model given by the rows. By default that is
+        the model's only such key besides the primary key, or the primary
+        key if the rows give no other one (create schemas usually leave `id`
+        to its uuid7 default, which never conflicts). Rows with the same
+        conflict key are collapsed, the last one wins. Returned schemas are
+        not in the input order.
+
+        Rows are sent in chunks that fit the bind parameter limit. With
+        `concurrency` > 1 up to that many chunks run at once, each on its own
+        connection and transaction, so a failure doesn't roll back the chunks
+        already committed.
+        """
+        if not data:
+            return []
+
+        try:
+            rows = [x.model_dump() for x in data]
+            table = cast(sa.Table, self.model_type.__table__)
+            columns = [c for c in rows[0] if c in table.c]
+            conflict_columns = self._conflict_columns(columns, conflict_columns)
+            # ON CONFLICT DO UPDATE can't touch one row twice in a statement
+            rows = list(
+                {tuple(row[c] for c in conflict_columns): row for row in rows}.values()
+            )
+
+            if update_columns is None:
+                update_columns = [c for c in columns if c not in conflict_columns]
+            stmt = statements.upsert(
+                self.model_type, tuple(conflict_columns), tuple(update_columns)
+            )
+            chunk_size = statements.rows_per_statement(
+                statements.insert_params_per_row(self.model_type, columns)
+            )
+            chunks = list(batched(rows, chunk_size))
+
+            async def upsert_chunk(
+                session: AsyncSession, chunk: tuple[dict[str, Any], ...]
+            ) -> Sequence[ModelType]:
+                # One INSERT ... VALUES statement for the whole chunk, chunks
+                # are sized for its parameters including the defaulted ones
+                result = await session.scalars(
+                    stmt,
+                    list(chunk),
+                    execution_options={"insertmanyvalues_page_size": chunk_size},
+                )
+                return result.all()
+
+            items: list[ModelType] = []
+            # Chunks of a unit of work have to share its transaction
+            if (
+                concurrency <= 1
+                or len(chunks) == 1
+                or current_unit_of_work.get() is not None
+            ):
+                async with transaction(self.session) as session:
+                    for chunk in chunks:
+                        items.extend(await upsert_chunk(session, chunk))
+            else:
+
+                async def upsert_separately(
+                    chunk: tuple[dict[str, Any], ...],
+                ) -> Sequence[ModelType]:
+                    # Same session class as the factory's, e.g. DeadlineSession
+                    async with AsyncSession(
+                        bind=self.session.bind,
+                        expire_on_commit=False,
+                        sync_session_class=self.session.sync_session_class,
+                    ) as session:
+                        chunk_items = await upsert_chunk(session, chunk)
+                        await session.commit()
+
+                        return chunk_items
+
+                for group in batched(chunks, concurrency):
+                    for chunk_items in await asyncio.gather(
+                        *(upsert_separately(chunk) for chunk in group)
+                    ):
+                        items.extend(chunk_items)
+
+            if (cache := self.cache) is not None:
+                ids = [item.id for item in items]
+                on_commit(lambda: cache.invalidate_many(ids))
+
+            return list_adapter(self.read_schema_type).validate_python(
+                items, from_attributes=True
+            )
+        except Exception as e:
+            self.handle_errors(e)
+
+    def _conflict_columns(
+        self: Self, columns: Sequence[str], conflict_columns: Sequence[str] | None
+    ) -> tuple[str, ...]:
+        keys = unique_keys(self.model_type)
+        if conflict_columns is not None:
+            if set(conflict_columns) not in [set(key) for key in keys]:
+                raise InvalidConflictColumnsError(
+                    f"{self.model_type.__name__} has no unique key on: "
+                    f"{', '.join(conflict_columns)}"
+                )
+            missing = [c for c in conflict_columns if c not in columns]
+            if missing:
+                raise InvalidConflictColumnsError(
+                    f"Rows don't provide the conflict columns: {', '.join(missing)}"
+                )
+            return tuple(conflict_columns)
+
+        primary_key, *natural_keys = keys
+        given = [key for key in natural_keys if all(c in columns for c in key)]
+        if len(given) == 1:
+            return given[0]
+        if not given and all(c in columns for c in primary_key):
+            return primary_key
+
+        raise InvalidConflictColumnsError(
+            f"Rows of {self.model_type.__name__} give "
+            f"{'several unique keys' if given else 'no unique key'}, "
+            "pass conflict_columns"
+        )
+
+    @timed_repository_method
+    async def update(self: Self, data: UpdateSchemaType) -> ReadSchemaType | NoReturn:
+        try:
+            async with transaction(self.session) as session:
+                pk = data.id
+                values = data.model_dump(exclude={"id"}, exclude_unset=True)
+                stmt = statements.update_by_id(self.model_type, tuple(sorted(values)))
+                params = {f"set_{column}": value for column, value in values.items()}
+                item = (await session.execute(stmt, {"pk": pk, **params})).scalar_one()
+
+            if (cache := self.cache) is not None:
+                on_commit(lambda: cache.invalidate(pk))
+
+            return self.read_schema_type.model_validate(item, from_attributes=True)
+        except Exception as e:
+            self.handle_errors(e)
+
+    @timed_repository_method
     async def bulk_update(
         self: Self, data: list[UpdateSchemaType]
     ) -> list[ReadSchemaType] | NoReturn:
+        """
+        Updates the set fields of every object. Rows are grouped by the set of
+        fields they update and each group is sent as `UPDATE ... FROM
+        (VALUES ...)` chunked to the bind parameter limit, so the number of
+        statements depends on the groups, not the rows. Objects with the same
+        id are merged, later fields win.
+        """
+        if not data:
+            return []
+
         try:
-            async with self.session as session:
-                stmt = sa.update(self.model_type).returning(self.model_type)
-                items = (
-                    await session.execute(
-                        stmt, [x.model_dump(exclude_unset=True) for x in data]
-                    )
-                ).all()
-                await session.commit()
+            rows: dict[UUID, dict[str, Any]] = {}
+            for x in data:
+                rows.setdefault(x.id, {}).update(
+                    x.model_dump(exclude={"id"}, exclude_unset=True)
+                )
 
-                return [
-                    self.read_schema_type.model_validate(item, from_attributes=True)
-                    for item in items
-                ]
+            groups: dict[tuple[str, ...], list[tuple[Any, ...]]] = {}
+            for pk, values in rows.items():
+                columns = tuple(sorted(values))
+                groups.setdefault(columns, []).append(
+                    (pk, *(values[column] for column in columns))
+                )
+
+            items: list[ModelType] = []
+            async with transaction(self.session) as session:
+                for columns, group in groups.items():
+                    chunk_size = statements.rows_per_statement(len(columns) + 1)
+                    for chunk in batched(group, chunk_size):
+                        stmt = statements.update_from_values(
+                            self.model_type, columns, chunk
+                        )
+                        items.extend((await session.scalars(stmt)).all())
+
+            if (cache := self.cache) is not None:
+                on_commit(lambda: cache.invalidate_many(rows))
+
+            return list_adapter(self.read_schema_type).validate_python(
+                items, from_attributes=True
+            )
         except Exception as e:
             self.handle_errors(e)
 
+    @timed_repository_method
     async def delete(self: Self, id: UUID) -> None | NoReturn:
         try:
-            async with self.session as session:
-                stmt = sa.delete(self.model_type).where(self.model_type.id == id)
-                await session.execute(stmt)
-                await session.commit()
+            async with transaction(self.session) as session:
+                stmt = statements.delete_by_id(self.model_type)
+                await session.execute(stmt, {"id": id})
+
+            if (cache := self.cache) is not None:
+                on_commit(lambda: cache.invalidate(id))
+
+            return None
+        except Exception as e:
+            self.handle_errors(e)
+
+    @timed_repository_method
+    async def get_etag(
+        self: Self, id: UUID, fields: Sequence[str] | None = None
+    ) -> str | None | NoReturn:
+        """
+        Weak ETag of the object read by `get(id, fields)`, from its
+        `etag_column` alone. None if the model has no such column or the
+        object doesn't exist.
+        """
+        table = cast(sa.Table, self.model_type.__table__)
+        if self.etag_column not in table.c:
+            return None
+
+        try:
+            async with session_scope(self.read_session) as session:
+                stmt = statements.select_by_id(self.model_type, (self.etag_column,))
+                version = (await session.execute(stmt, {"id": id})).scalar()
+
+            if version is None:
+                return None
+
+            return self._etag(id, version, fields)
+        except Exception as e:
+            self.handle_errors(e)
+
+    @timed_repository_method
+    async def get_with_etag(
+        self: Self, id: UUID, fields: Sequence[str] | None = None
+    ) -> tuple[ReadSchemaType, str | None] | NoReturn:
+        """
+        `get(id, fields)` together with the ETag of the object returned, both
+        from one uncached read, so the ETag always describes the body sent.
+        The ETag is the one `get_etag` gives for the same row version.
+        """
+        table = cast(sa.Table, self.model_type.__table__)
+        if self.etag_column not in table.c:
+            return await self.get(id, fields), None
+
+        try:
+            # Entities carry the ETag column already, projections select it
+            columns, schema_type = self._projection(
+                fields, required=(self.etag_column,)
+            )
+            async with session_scope(self.read_session) as session:
+                stmt = statements.select_by_id(self.model_type, columns)
+                result = await session.execute(stmt, {"id": id})
+                row = (result.scalars() if columns is None else result).first()
+                if row is None:
+                    raise SQLARepositoryObjectNotFoundError(
+                        f"{self.model_type.__name__} with id: {id} not found"
+                    )
+
+                item = schema_type.model_validate(row, from_attributes=True)
+                version = getattr(row, self.etag_column)
 
+            return item, self._etag(id, version, fields)
+        except Exception as e:
+            self.handle_errors(e)
+
+    @timed_repository_method
+    async def get_list_etag(
+        self: Self,
+        pagination: PaginationSchema | CursorPaginationSchema,
+        model_paginator_type: Type[SQLAlchemyModelPaginator[ReadSchemaType]],
+        fields: Sequence[str] | None = None,
+        query: QuerySpecSchema | None = None,
+    ) -> str | None | NoReturn:
+        """
+        Weak ETag of the page `get_all_paginated` returns for the same
+        arguments: `max(etag_column)` of the filtered rows, their count, and
+        the shape of the request. None if the model has no `etag_column`.
+
+        The count is taken with the paginator's count strategy over the
+        page's own statement, so a `cached` or `estimate` count is shared
+        with the page and deletions show up only as fast as the page's total
+        does. A write committed with an `etag_column` older than the current
+        max (a transaction that started before the latest write) goes
+        unnoticed until the next change.
+        """
+        table = cast(sa.Table, self.model_type.__table__)
+        if self.etag_column not in table.c:
             return None
+
+        try:
+            columns, _ = (
+                self._projection(fields, required=self.cursor_columns)
+                if isinstance(pagination, CursorPaginationSchema)
+                else self._projection(fields)
+            )
+            statement = self._query_statement(columns, query)
+            # Sorting doesn't change the max, only the shape
+            version_statement = statement.with_only_columns(
+                sa.func.max(table.c[self.etag_column])
+            ).order_by(None)
+
+            async with session_scope(self.read_session) as session:
+                version = await session.scalar(version_statement)
+
+            count, _ = await model_paginator_type(self.read_session).count(statement)
+
+            return weak_etag(
+                self.read_schema_type.__name__,
+                version,
+                count,
+                type(pagination).__name__,
+                pagination,
+                fields,
+                query,
+            )
         except Exception as e:
             self.handle_errors(e)
 
+    @timed_repository_method
+    async def get_all_paginated_with_etag(
+        self: Self,
+        pagination: PaginationSchema | CursorPaginationSchema,
+        model_paginator_type: Type[SQLAlchemyModelPaginator[ReadSchemaType]],
+        fields: Sequence[str] | None = None,
+        query: QuerySpecSchema | None = None,
+    ) -> (
+        tuple[
+            PaginatedResponseSchema[ReadSchemaType]
+            | CursorPaginatedResponseSchema[ReadSchemaType],
+            str | None,
+        ]
+        | NoReturn
+    ):
+        """
+        `get_all_paginated` together with the `get_list_etag` of the page.
+        The ETag is read first, so a write landing in between leaves it older
+        than the page and the next request gets the page again; it never
+        describes a newer page than the one sent.
+        """
+        etag = await self.get_list_etag(pagination, model_paginator_type, fields, query)
+        page = await self.get_all_paginated(
+            pagination, model_paginator_type, fields, query
+        )
+        return page, etag
+
+    async def stream_all(
+        self: Self,
+        statement: Select[tuple[Any]] | None = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[list[ReadSchemaType]]:
+        """
+        Yields read schemas in chunks of `chunk_size` rows fetched from a
+        server side cursor, so memory use doesn't depend on the result size.
+        The session stays checked out until the stream is exhausted or closed.
+        """
+        if statement is None:
+            columns, _ = self._projection()
+            statement = statements.select_columns(self.model_type, columns)
+
+        list_validator = list_adapter(self.read_schema_type)
+        try:
+            async with session_scope(self.read_session) as session:
+                result = await session.stream(
+                    statement.execution_options(yield_per=chunk_size)
+                )
+                partitions = (
+                    result.scalars().partitions()
+                    if is_entity_select(statement)
+                    else result.partitions()
+                )
+                async for partition in partitions:
+                    yield list_validator.validate_python(
+                        partition, from_attributes=True
+                    )
+        except Exception as e:
+            self.handle_errors(e)
+
+    @overload
     async def get_all_paginated(
         self: Self,
         pagination: PaginationSchema,
         model_paginator_type: Type[SQLAlchemyModelPaginator[ReadSchemaType]],
-    ) -> PaginatedResponseSchema[ReadSchemaType] | NoReturn:
+        fields: Sequence[str] | None = None,
+        query: QuerySpecSchema | None = None,
+    ) -> PaginatedResponseSchema[ReadSchemaType] | NoReturn: ...
+
+    @overload
+    async def get_all_paginated(
+        self: Self,
+        pagination: CursorPaginationSchema,
+        model_paginator_type: Type[SQLAlchemyModelPaginator[ReadSchemaType]],
+        fields: Sequence[str] | None = None,
+        query: QuerySpecSchema | None = None,
+    ) -> CursorPaginatedResponseSchema[ReadSchemaType] | NoReturn: ...
+
+    @timed_repository_method
+    async def get_all_paginated(
+        self: Self,
+        pagination: PaginationSchema | CursorPaginationSchema,
+        model_paginator_type: Type[SQLAlchemyModelPaginator[ReadSchemaType]],
+        fields: Sequence[str] | None = None,
+        query: QuerySpecSchema | None = None,
+    ) -> (
+        PaginatedResponseSchema[ReadSchemaType]
+        | CursorPaginatedResponseSchema[ReadSchemaType]
+        | NoReturn
+    ):
         try:
-            stmt = sa.select(self.model_type)
-            model_paginator = model_paginator_type(self.session)
+            model_paginator = model_paginator_type(self.read_session)
+            if isinstance(pagination, CursorPaginationSchema):
+                # Cursors are built from the keyset values of the rows
+                columns, schema_type = self._projection(
+                    fields, required=self.cursor_columns
+                )
+                if query is not None and query.sort:
+                    raise InvalidQuerySpecError(
+                        "Cursor pagination is ordered by its keyset, "
+                        "sort is not supported"
+                    )
+                return await model_paginator.get_cursor_list(
+                    statement=self._query_statement(columns, query),
+                    cursor=pagination.cursor,
+                    page_size=pagination.page_size,
+                    keyset=[
+                        getattr(self.model_type, name) for name in self.cursor_columns
+                    ],
+                    item_type=schema_type,
+                )
+
+            columns, schema_type = self._projection(fields)
             return await model_paginator.get_list(
-                statement=stmt, page=pagination.page, page_size=pagination.page_size
+                statement=self._query_statement(columns, query),
+                page=pagination.page,
+                page_size=pagination.page_size,
+                item_type=schema_type,
             )
         except Exception as e:
             self.handle_errors(e)
 
+    def _query_statement(
+        self: Self,
+        columns: tuple[str, ...] | None,
+        query: QuerySpecSchema | None = None,
+    ) -> Select[tuple[Any]]:
+        statement = statements.select_columns(self.model_type, columns)
+        if query is None:
+            return statement
+
+        return apply_query_spec(
+            statement,
+            self.model_type,
+            query,
+            filterable=self.filterable_columns,
+            sortable=self.sortable_columns,
+            prefixable=self.prefix_columns,
+        )
+
+    @property
+    def _replica_lag(self: Self) -> float:
+        # A separate read session may be a replica that hasn't seen the
+        # latest writes yet, see settings.db.read_your_writes_window
+        if self.read_session is self.session:
+            return 0.0
+
+        return settings.db.read_your_writes_window
+
+    @property
+    def _read_cache(self: Self) -> LRUTTLCache[UUID, ReadSchemaType] | None:
+        # Reads inside a unit of work may see its uncommitted writes
+        return self.cache if current_unit_of_work.get() is None else None
+
+    def _projection(
+        self: Self,
+        fields: Sequence[str] | None = None,
+        required: Sequence[str] = (),
+    ) -> tuple[tuple[str, ...] | None, Type[ReadSchemaType]]:
+        """
+        Columns to select (None for ORM entities) and the schema to validate
+        the rows with. Requested `fields` give a partial read schema, whereas
+        `required` columns are selected but left out of the dumped items.
+        Only `PydanticJSONRoute` routes send partial schemas as they are,
+        see its docstring.
+        """
+        if fields is not None:
+            requested = projection_columns(
+                self.model_type, self.read_schema_type, fields
+            )
+            schema_type = partial_schema(self.read_schema_type, frozenset(requested))
+            return (
+                tuple(dict.fromkeys((*requested, *required))),
+                cast(Type[ReadSchemaType], schema_type),
+            )
+
+        if self.projection:
+            columns = projection_columns(self.model_type, self.read_schema_type)
+            return (
+                tuple(dict.fromkeys((*columns, *required))),
+                self.read_schema_type,
+            )
+
+        return None, self.read_schema_type
+
+    def _etag(self: Self, id: UUID, version: Any, fields: Sequence[str] | None) -> str:
+        return weak_etag(self.read_schema_type.__name__, id, version, fields)
+
+    @staticmethod
+    def _validate_result(
+        result: Result[Any],
+        columns: tuple[str, ...] | None,
+        schema_type: Type[ReadSchemaType],
+    ) -> list[ReadSchemaType]:
+        rows = result.scalars().all() if columns is None else result.all()
+        items: list[ReadSchemaType] = list_adapter(schema_type).validate_python(
+            rows, from_attributes=True
+        )
+        return items
+
     @staticmethod
     def handle_errors(e: Exception) -> NoReturn:
-        if isinstance(e, OperationalError):
+        if isinstance(e, DeadlineExceededError):
+            raise SQLARepositoryTimeoutError(str(e))
+        elif (
+            isinstance(e, DBAPIError)
+            and getattr(e.orig, "sqlstate", None) == QUERY_CANCELED_SQLSTATE
+        ):
+            raise SQLARepositoryTimeoutError(f"Query execution timeout: {str(e)}")
+        elif isinstance(e, OperationalError):
             raise SQLARepositoryOperationalError(f"Database operation error: {str(e)}")
         elif isinstance(e, SQLARepositoryObjectNotFoundError):
             raise e
+        elif isinstance(e, RepositoryException):
+            raise e
         elif isinstance(e, IntegrityError):
             raise SQLARepositoryIntegrityError(f"Data integrity violation: {str(e)}")
         elif isinstance(e, DataError):
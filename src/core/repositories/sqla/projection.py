@@ -0,0 +1,107 @@
+import functools
+from typing import Any, Optional, Sequence
+
+from pydantic import BaseModel, Field, TypeAdapter, create_model
+from sqlalchemy import inspect
+from sqlalchemy.sql import Select
+
+from src.core.repositories.exceptions import InvalidFieldsError
+from src.db.base import Base
+
+
+@functools.cache
+def list_adapter(schema_type: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    """
+    Validates a whole batch of ORM objects or rows in one call.
+    """
+    return TypeAdapter(list[schema_type])  # type: ignore[valid-type]
+
+
+@functools.cache
+def _schema_columns(
+    model_type: type[Base], schema_type: type[BaseModel]
+) -> frozenset[str]:
+    mapper = inspect(model_type)
+    return frozenset(
+        name for name in schema_type.model_fields if name in mapper.columns
+    )
+
+
+def projection_columns(
+    model_type: type[Base],
+    schema_type: type[BaseModel],
+    fields: Sequence[str] | None = None,
+) -> tuple[str, ...]:
+    """
+    Names of the model columns backing `fields` (all fields of `schema_type`
+    by default), without duplicates.
+    Raises `InvalidFieldsError` for fields that aren't mapped to a column.
+    """
+    columns = _schema_columns(model_type, schema_type)
+    names = schema_type.model_fields if fields is None else fields
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise InvalidFieldsError(
+            f"{schema_type.__name__} has no column fields: {', '.join(unknown)}"
+        )
+
+    return tuple(dict.fromkeys(names))
+
+
+# Partial schemas and the schemas they were made from
+_partial_schemas: dict[type[BaseModel], type[BaseModel]] = {}
+
+
+@functools.cache
+def partial_schema(
+    schema_type: type[BaseModel], fields: frozenset[str]
+) -> type[BaseModel]:
+    """
+    Subclass of `schema_type` in which the fields not in `fields` are
+    optional, default to None and are left out when dumped.
+    """
+    partial: type[BaseModel] = create_model(  # type: ignore[call-overload]
+        f"Partial{schema_type.__name__}",
+        __base__=schema_type,
+        **{
+            name: (Optional[field.annotation], Field(default=None, exclude=True))
+            for name, field in schema_type.model_fields.items()
+            if name not in fields
+        },
+    )
+    _partial_schemas[partial] = schema_type
+    return partial
+
+
+def is_projection_of(model_type: type[Any], schema_type: Any) -> bool:
+    """
+    Whether `model_type` is a `partial_schema` of `schema_type`, or the same
+    generic model with partial schemas as type arguments (e.g. a page of
+    partial read schemas for `PaginatedResponseSchema[ReadSchema]`).
+    """
+    if _partial_schemas.get(model_type) is schema_type:
+        return True
+
+    metadata = getattr(model_type, "__pydantic_generic_metadata__", None)
+    expected = getattr(schema_type, "__pydantic_generic_metadata__", None)
+    if not metadata or not expected or metadata["origin"] is None:
+        return False
+
+    return (
+        metadata["origin"] is expected["origin"]
+        and len(metadata["args"]) == len(expected["args"])
+        and all(
+            arg is expected_arg or _partial_schemas.get(arg) is expected_arg
+            for arg, expected_arg in zip(metadata["args"], expected["args"])
+        )
+    )
+
+
+def is_entity_select(statement: Select[Any]) -> bool:
+    """
+    Whether `statement` selects a single ORM entity rather than columns.
+    """
+    descriptions = statement.column_descriptions
+    return (
+        len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]
+    )
@@ -0,0 +1,202 @@
+import functools
+from typing import Any, Sequence, TypeVar, cast
+
+import sqlalchemy as sa
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.sql import ColumnElement, Select
+
+from src.core.repositories.exceptions import InvalidQuerySpecError
+from src.core.schemas import FilterSchema, QuerySpecSchema
+from src.db.base import Base
+
+
+SelectType = TypeVar("SelectType", bound=Select[Any])
+
+# Operator classes and collations whose btree order serves LIKE 'prefix%'
+PATTERN_OPS = frozenset(
+    {"text_pattern_ops", "varchar_pattern_ops", "bpchar_pattern_ops"}
+)
+PATTERN_COLLATIONS = frozenset({"C", "POSIX"})
+
+
+@functools.cache
+def indexed_columns(model_type: type[Base]) -> frozenset[str]:
+    """
+    Columns that lead an index, a unique constraint or the primary key, i.e.
+    the ones a btree can filter or sort by without scanning the table.
+    """
+    table = cast(sa.Table, model_type.__table__)
+    leading = [
+        *(index.expressions[0] for index in table.indexes if index.expressions),
+        *(
+            next(iter(constraint.columns))
+            for constraint in table.constraints
+            if isinstance(constraint, (sa.PrimaryKeyConstraint, sa.UniqueConstraint))
+            and len(constraint.columns)
+        ),
+    ]
+    return frozenset(column.name for column in leading if isinstance(column, sa.Column))
+
+
+@functools.cache
+def unique_keys(model_type: type[Base]) -> tuple[tuple[str, ...], ...]:
+    """
+    Column sets of the primary key, unique constraints and unique indexes,
+    i.e. the conflict targets `INSERT ... ON CONFLICT` accepts. The primary
+    key comes first. Expression and partial indexes are left out.
+    """
+    table = cast(sa.Table, model_type.__table__)
+    keys = [tuple(column.name for column in table.primary_key.columns)]
+    keys.extend(
+        tuple(column.name for column in constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, sa.UniqueConstraint)
+    )
+    keys.extend(
+        tuple(column.name for column in index.expressions)  # type: ignore[union-attr]
+        for index in table.indexes
+        if index.unique
+        and index.dialect_options["postgresql"]["where"] is None
+        and all(isinstance(column, sa.Column) for column in index.expressions)
+    )
+    return tuple(dict.fromkeys(key for key in keys if key))
+
+
+def check_indexed(model_type: type[Base], columns: Sequence[str]) -> None:
+    """
+    Raises TypeError for `columns` that aren't columns of `model_type` or
+    don't lead any of its indexes.
+    """
+    indexed = indexed_columns(model_type)
+    not_indexed = [column for column in columns if column not in indexed]
+    if not_indexed:
+        raise TypeError(
+            f"{model_type.__name__} has no index led by: {', '.join(not_indexed)}"
+        )
+
+
+@functools.cache
+def prefix_indexed_columns(model_type: type[Base]) -> frozenset[str]:
+    """
+    Columns that lead an index a btree can match LIKE 'prefix%' against:
+    one with a pattern operator class (`postgresql_ops`), or any index of a
+    column with the "C" collation. Plain indexes in other collations can't.
+    """
+    table = cast(sa.Table, model_type.__table__)
+    columns = {
+        name
+        for name in indexed_columns(model_type)
+        if getattr(table.c[name].type, "collation", None) in PATTERN_COLLATIONS
+    }
+    for index in table.indexes:
+        column = index.expressions[0] if index.expressions else None
+        ops = index.dialect_options["postgresql"]["ops"] or {}
+        if isinstance(column, sa.Column) and ops.get(column.name) in PATTERN_OPS:
+            columns.add(column.name)
+
+    return frozenset(columns)
+
+
+def check_prefix_indexed(model_type: type[Base], columns: Sequence[str]) -> None:
+    """
+    Raises TypeError for `columns` that don't lead an index usable by prefix
+    filters, see `prefix_indexed_columns`.
+    """
+    indexed = prefix_indexed_columns(model_type)
+    not_indexed = [column for column in columns if column not in indexed]
+    if not_indexed:
+        raise TypeError(
+            f'{model_type.__name__} has no pattern ops or "C" collation index '
+            f"led by: {', '.join(not_indexed)}"
+        )
+
+
+@functools.cache
+def _value_adapter(python_type: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(python_type)
+
+
+def _coerce(column: sa.Column[Any], value: Any) -> Any:
+    # Values come from JSON or query strings, e.g. datetimes as strings
+    if value is None:
+        return None
+
+    python_type: Any = column.type.python_type
+    return _value_adapter(python_type).validate_python(value)
+
+
+def _condition(column: sa.Column[Any], spec: FilterSchema) -> ColumnElement[bool]:
+    if spec.op == "in":
+        return column.in_([_coerce(column, value) for value in spec.value])
+
+    if spec.op == "range":
+        low, high = (_coerce(column, value) for value in spec.value)
+        conditions = []
+        if low is not None:
+            conditions.append(column >= low)
+        if high is not None:
+            conditions.append(column <= high)
+        return sa.and_(*conditions)
+
+    if spec.op == "prefix":
+        if column.type.python_type is not str:
+            raise InvalidQuerySpecError(f"'prefix' needs a text column: {spec.field}")
+        return column.startswith(spec.value, autoescape=True)
+
+    condition: ColumnElement[bool] = column == _coerce(column, spec.value)
+    return condition
+
+
+def apply_query_spec(
+    statement: SelectType,
+    model_type: type[Base],
+    spec: QuerySpecSchema,
+    filterable: Sequence[str],
+    sortable: Sequence[str],
+    prefixable: Sequence[str] = (),
+) -> SelectType:
+    """
+    Adds the filters and the ORDER BY of `spec` to `statement`. Sorted
+    statements end with the primary key so that pages are stable.
+    Raises `InvalidQuerySpecError` for fields outside `filterable` /
+    `sortable`, prefix filters on fields outside `prefixable` and for values
+    that don't fit the column type.
+    """
+    table = cast(sa.Table, model_type.__table__)
+    not_allowed = [f.field for f in spec.filters if f.field not in filterable] + [
+        s.field for s in spec.sort if s.field not in sortable
+    ]
+    if not_allowed:
+        raise InvalidQuerySpecError(
+            f"Can't filter or sort {model_type.__name__} by: {', '.join(not_allowed)}"
+        )
+
+    not_prefixable = [
+        f.field for f in spec.filters if f.op == "prefix" and f.field not in prefixable
+    ]
+    if not_prefixable:
+        raise InvalidQuerySpecError(
+            f"Can't filter {model_type.__name__} by prefix of: "
+            f"{', '.join(not_prefixable)}"
+        )
+
+    try:
+        conditions = [_condition(table.c[f.field], f) for f in spec.filters]
+    except (ValidationError, NotImplementedError) as e:
+        raise InvalidQuerySpecError(f"Invalid filter value: {e}") from e
+
+    if conditions:
+        statement = statement.where(*conditions)
+
+    if spec.sort:
+        order_by = [
+            table.c[s.field].desc() if s.direction == "desc" else table.c[s.field]
+            for s in spec.sort
+        ]
+        sorted_fields = {s.field for s in spec.sort}
+        order_by.extend(
+            column for column in table.primary_key if column.name not in sorted_fields
+        )
+        statement = statement.order_by(*order_by)
+
+    return statement
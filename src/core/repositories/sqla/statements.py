@@ -0,0 +1,161 @@
+import functools
+from typing import Any, Sequence, cast
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Delete, Select
+from sqlalchemy.sql.dml import ReturningInsert, ReturningUpdate
+
+from src.db.base import Base
+
+
+# Statements of the repository hot paths, built once per model with bind
+# parameters instead of values. A prebuilt construct memoizes its cache key,
+# so executing it skips building the statement and generating the key, and
+# the SQL text stays the same, so asyncpg reuses its prepared statement.
+
+# Bind parameters per statement allowed by the PostgreSQL wire protocol
+MAX_BIND_PARAMS = 32767
+
+
+def rows_per_statement(columns: int) -> int:
+    """
+    Rows of `columns` parameters each that fit into one statement.
+    """
+    return max(MAX_BIND_PARAMS // max(columns, 1), 1)
+
+
+def insert_params_per_row(model_type: type[Base], columns: Sequence[str]) -> int:
+    """
+    Bind parameters an INSERT of `columns` takes per row: the given columns
+    plus the ones filled by Python-side defaults (e.g. a generated `id`).
+    """
+    table = cast(sa.Table, model_type.__table__)
+    return len(columns) + sum(
+        1
+        for column in table.c
+        if column.name not in columns
+        and isinstance(column.default, sa.ColumnDefault)
+        and not column.default.is_clause_element
+    )
+
+
+def on_update_values(
+    model_type: type[Base], exclude: tuple[str, ...] = ()
+) -> dict[str, Any]:
+    """
+    SQL expression `onupdate` defaults of the model (e.g. `updated_at`),
+    which statements that don't go through `sa.update` have to set themselves.
+    """
+    table = cast(sa.Table, model_type.__table__)
+    return {
+        column.name: column.onupdate.arg
+        for column in table.c
+        if column.name not in exclude
+        and isinstance(column.onupdate, sa.ColumnDefault)
+        and column.onupdate.is_clause_element
+    }
+
+
+@functools.cache
+def select_columns(
+    model_type: type[Base], columns: tuple[str, ...] | None = None
+) -> Select[tuple[Any]]:
+    """
+    The model entity, or just `columns` as plain rows.
+    """
+    if columns is None:
+        return sa.select(model_type)
+
+    return sa.select(*(getattr(model_type, column) for column in columns))
+
+
+@functools.cache
+def select_by_id(
+    model_type: type[Base], columns: tuple[str, ...] | None = None
+) -> Select[tuple[Any]]:
+    return select_columns(model_type, columns).where(
+        model_type.id == sa.bindparam("id")
+    )
+
+
+@functools.cache
+def select_by_ids(
+    model_type: type[Base], columns: tuple[str, ...] | None = None
+) -> Select[tuple[Any]]:
+    return select_columns(model_type, columns).where(
+        model_type.id.in_(sa.bindparam("ids", expanding=True))
+    )
+
+
+@functools.cache
+def delete_by_id(model_type: type[Base]) -> Delete:
+    return sa.delete(model_type).where(model_type.id == sa.bindparam("id"))
+
+
+@functools.cache
+def update_by_id(
+    model_type: type[Base], columns: tuple[str, ...]
+) -> ReturningUpdate[tuple[Any]]:
+    """
+    Params: `pk` and `set_<column>` for each of `columns`, which should be
+    passed in a stable order so that a set of columns has one cache entry.
+    """
+    return (
+        sa.update(model_type)
+        .where(model_type.id == sa.bindparam("pk"))
+        .values(
+            {
+                column: sa.bindparam(
+                    f"set_{column}", type_=getattr(model_type, column).type
+                )
+                for column in columns
+            }
+        )
+        .returning(model_type)
+    )
+
+
+@functools.cache
+def upsert(
+    model_type: type[Base],
+    conflict_columns: tuple[str, ...],
+    update_columns: tuple[str, ...],
+) -> ReturningInsert[tuple[Any]]:
+    """
+    `INSERT ... ON CONFLICT (conflict_columns) DO UPDATE` of `update_columns`
+    with the proposed values, for executemany with one dict per row.
+    """
+    stmt = postgresql.insert(model_type)
+    values: dict[str, Any] = {
+        column: stmt.excluded[column] for column in update_columns
+    }
+    values.update(on_update_values(model_type, exclude=update_columns))
+    if not values:
+        return stmt.on_conflict_do_nothing(index_elements=conflict_columns).returning(
+            model_type
+        )
+
+    return stmt.on_conflict_do_update(
+        index_elements=conflict_columns, set_=values
+    ).returning(model_type)
+
+
+def update_from_values(
+    model_type: type[Base], columns: tuple[str, ...], rows: Sequence[tuple[Any, ...]]
+) -> ReturningUpdate[tuple[Any]]:
+    """
+    `UPDATE ... SET ... FROM (VALUES ...) AS v WHERE id = v.id` of `rows`,
+    which are `(id, *columns)` tuples. `onupdate` defaults still apply.
+    """
+    table = cast(sa.Table, model_type.__table__)
+    values = sa.values(
+        *(sa.column(column, table.c[column].type) for column in ("id", *columns)),
+        name="v",
+    ).data(list(rows))
+    return (
+        sa.update(model_type)
+        .where(model_type.id == values.c.id)
+        .values({column: values.c[column] for column in columns})
+        .returning(model_type)
+    )
@@ -0,0 +1,34 @@
+import asyncio
+from typing import Self
+
+
+class RequestTracker:
+    """
+    Counts the requests in progress, so that shutdown can wait for them.
+    """
+
+    def __init__(self: Self) -> None:
+        self.in_flight: int = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def started(self: Self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def finished(self: Self) -> None:
+        self.in_flight -= 1
+        if self.in_flight == 0:
+            self._idle.set()
+
+    async def drain(self: Self, timeout: float) -> bool:
+        """
+        Waits up to `timeout` seconds for the requests in progress to finish.
+        Returns False if some are still running.
+        """
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except TimeoutError:
+            return False
+
+        return True
@@ -0,0 +1,142 @@
+import csv
+import hashlib
+import io
+from typing import Any, AsyncIterator, Awaitable, Callable, Mapping, Self, Sequence
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.background import BackgroundTask
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response rendered by pydantic-core instead of `json.dumps`.
+    Models are serialized straight to bytes by their own serializer, with
+    `dump_options` passed to it (e.g. `by_alias`, `exclude_unset`); any other
+    content is serialized with `pydantic_core.to_json`.
+    """
+
+    def __init__(
+        self: Self,
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+        dump_options: dict[str, Any] | None = None,
+    ) -> None:
+        self.dump_options = dump_options or {}
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self: Self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content, **self.dump_options)
+
+        return to_json(content)
+
+
+def ndjson_streaming_response(
+    stream: AsyncIterator[Sequence[BaseModel]],
+    headers: dict[str, str] | None = None,
+) -> StreamingResponse:
+    """
+    Streams chunks of schemas (e.g. from `BaseSQLAlchemyRepositoryImpl.stream_all`)
+    as newline delimited JSON, one body part per chunk.
+    """
+
+    async def body() -> AsyncIterator[bytes]:
+        async for chunk in stream:
+            yield b"".join(
+                item.__pydantic_serializer__.to_json(item) + b"\n" for item in chunk
+            )
+
+    return StreamingResponse(body(), media_type="application/x-ndjson", headers=headers)
+
+
+def csv_streaming_response(
+    stream: AsyncIterator[Sequence[BaseModel]],
+    schema_type: type[BaseModel],
+    filename: str | None = None,
+) -> StreamingResponse:
+    """
+    Streams chunks of schemas as CSV with a header row of `schema_type` fields.
+    The header is sent before the first chunk is fetched.
+    """
+    fields = list(schema_type.model_fields)
+
+    async def body() -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        writer.writerow(fields)
+        yield buffer.getvalue().encode()
+
+        async for chunk in stream:
+            buffer.seek(0)
+            buffer.truncate()
+            for item in chunk:
+                row = item.model_dump(mode="json")
+                writer.writerow(row.get(field) for field in fields)
+            yield buffer.getvalue().encode()
+
+    headers = (
+        {"Content-Disposition": f'attachment; filename="{filename}"'}
+        if filename is not None
+        else None
+    )
+
+    return StreamingResponse(body(), media_type="text/csv", headers=headers)
+
+
+def weak_etag(*parts: Any) -> str:
+    """
+    Weak ETag (`W/"..."`) hashed from the JSON of `parts`.
+    """
+    digest = hashlib.blake2b(to_json(parts), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Weak comparison of `etag` with an `If-None-Match` header value.
+    """
+    if if_none_match is None:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+async def conditional_response(
+    request: Request,
+    etag: str | None,
+    content: Callable[[], Awaitable[tuple[Any, str | None]]],
+    dump_options: dict[str, Any] | None = None,
+) -> Response:
+    """
+    `304 Not Modified` if the request's `If-None-Match` matches `etag`,
+    without awaiting `content`, so the query and the serialization behind it
+    are skipped. Otherwise the awaited content with the ETag `content`
+    returned alongside it (e.g. `get_with_etag`), so the ETag describes the
+    body actually sent even if `etag` went stale meanwhile.
+    No ETag (e.g. the model has no `updated_at`) means an ordinary response.
+    """
+    if etag is not None and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    body, body_etag = await content()
+    return PydanticJSONResponse(
+        body,
+        headers={"ETag": body_etag} if body_etag is not None else None,
+        dump_options=dump_options,
+    )
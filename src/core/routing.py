@@ -0,0 +1,94 @@
+import asyncio
+import functools
+from typing import Any, Callable, Self
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.dependencies.models import Dependant
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+from src.core.repositories.sqla.projection import is_projection_of
+from src.core.responses import PydanticJSONResponse
+
+
+class PydanticJSONRoute(APIRoute):
+    """
+    Route that skips FastAPI's response serialization when the endpoint
+    returns an instance of exactly its `response_model`: the model was
+    validated when it was built, so it's dumped straight to JSON bytes with
+    the route's `response_model_*` options instead of being dumped to a dict,
+    validated again, serialized again and encoded by `json.dumps`.
+
+    Partial reads (the `fields` of repository reads) count as instances of
+    the response model they project, e.g. a page of partial read schemas for
+    `PaginatedResponseSchema[ReadSchema]`, and are dumped without the fields
+    that weren't selected. Any other return value (a dict, an ORM object, a
+    subclass of the response model) takes the regular path, which sends a
+    partial read as the full model with nulls for the unselected fields (or
+    fails validating it), so routes that accept `fields` must use this
+    route class. So do routes with a non-JSON
+    response class and routes whose endpoint or dependencies take a
+    `Response` parameter, as headers set on it only apply to the regular path.
+    """
+
+    def get_route_handler(self: Self) -> Callable[..., Any]:
+        call = self.dependant.call
+        if call is not None and self._can_return_model_directly():
+            self.dependant.call = self._wrap_endpoint(call)
+
+        return super().get_route_handler()
+
+    def _can_return_model_directly(self: Self) -> bool:
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+
+        return (
+            self.response_model is not None
+            and issubclass(response_class, JSONResponse)
+            and not self._uses_response_param(self.dependant)
+        )
+
+    def _wrap_endpoint(self: Self, call: Callable[..., Any]) -> Callable[..., Any]:
+        response_model = self.response_model
+        status_code = self.status_code or 200
+        dump_options: dict[str, Any] = {
+            "include": self.response_model_include,
+            "exclude": self.response_model_exclude,
+            "by_alias": self.response_model_by_alias,
+            "exclude_unset": self.response_model_exclude_unset,
+            "exclude_defaults": self.response_model_exclude_defaults,
+            "exclude_none": self.response_model_exclude_none,
+        }
+
+        def to_response(result: Any) -> Any:
+            if type(result) is not response_model and not is_projection_of(
+                type(result), response_model
+            ):
+                return result
+
+            return PydanticJSONResponse(
+                result, status_code=status_code, dump_options=dump_options
+            )
+
+        # FastAPI runs sync endpoints in a threadpool, so keep the call type
+        if asyncio.iscoroutinefunction(call):
+
+            @functools.wraps(call)
+            async def async_endpoint(*args: Any, **kwargs: Any) -> Any:
+                return to_response(await call(*args, **kwargs))
+
+            return async_endpoint
+
+        @functools.wraps(call)
+        def endpoint(*args: Any, **kwargs: Any) -> Any:
+            return to_response(call(*args, **kwargs))
+
+        return endpoint
+
+    @classmethod
+    def _uses_response_param(cls, dependant: Dependant) -> bool:
+        return dependant.response_param_name is not None or any(
+            cls._uses_response_param(sub_dependant)
+            for sub_dependant in dependant.dependencies
+        )
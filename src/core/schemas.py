@@ -1,7 +1,7 @@
-from typing import TypeVar, Generic
+from typing import Any, TypeVar, Generic, Literal, Self
 from uuid import UUID
 
-from pydantic import BaseModel, PositiveInt
+from pydantic import BaseModel, PositiveInt, NonNegativeInt, model_validator
 
 
 PaginationItem = TypeVar("PaginationItem", bound=BaseModel)
@@ -16,7 +16,64 @@ class PaginationSchema(BaseModel):
     page_size: PositiveInt
 
 
+class FilterSchema(BaseModel):
+    """
+    eq     - `value` is a scalar
+    in     - `value` is a non-empty list
+    range  - `value` is `[low, high]`, inclusive, None leaves a side open
+    prefix - `value` is the string the column starts with
+    """
+
+    field: str
+    op: Literal["eq", "in", "range", "prefix"] = "eq"
+    value: Any = None
+
+    @model_validator(mode="after")
+    def check_value(self: Self) -> Self:
+        if self.op == "in" and not (isinstance(self.value, list) and self.value):
+            raise ValueError("'in' expects a non-empty list")
+        if self.op == "range" and not (
+            isinstance(self.value, list)
+            and len(self.value) == 2
+            and any(bound is not None for bound in self.value)
+        ):
+            raise ValueError("'range' expects [low, high] with at least one bound")
+        if self.op == "prefix" and not (isinstance(self.value, str) and self.value):
+            raise ValueError("'prefix' expects a non-empty string")
+        if self.op == "eq" and isinstance(self.value, (list, dict)):
+            raise ValueError("'eq' expects a scalar")
+        return self
+
+
+class SortSchema(BaseModel):
+    field: str
+    direction: Literal["asc", "desc"] = "asc"
+
+
+class QuerySpecSchema(BaseModel):
+    """
+    Filters (combined with AND) and sort order of a paginated list. Only the
+    columns the repository declares as filterable or sortable are accepted.
+    """
+
+    filters: list[FilterSchema] = []
+    sort: list[SortSchema] = []
+
+
 class PaginatedResponseSchema(PaginationSchema, Generic[PaginationItem]):
-    total_pages: PositiveInt
-    total_items: PositiveInt
+    total_pages: NonNegativeInt
+    total_items: NonNegativeInt
+    count_type: Literal["exact", "estimated"] = "exact"
+    items: list[PaginationItem]
+
+
+class CursorPaginationSchema(BaseModel):
+    cursor: str | None = None
+    page_size: PositiveInt
+
+
+class CursorPaginatedResponseSchema(BaseModel, Generic[PaginationItem]):
+    page_size: PositiveInt
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
     items: list[PaginationItem]
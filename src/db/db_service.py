@@ -1,13 +1,183 @@
-from typing import AsyncGenerator, Self
+import asyncio
+import itertools
+import logging
+import os
+import time
+from uuid import uuid4
+from typing import Any, AsyncGenerator, Literal, Self, cast
 
+import sqlalchemy as sa
+from sqlalchemy.engine.interfaces import ExceptionContext
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncEngine,
     async_sessionmaker,
     AsyncSession,
 )
+from sqlalchemy.orm import Session, SessionTransaction
 
 from src.core.config import settings
+from src.core.deadlines import (
+    DeadlineExceededError,
+    current_deadline,
+    watch_disconnect,
+)
+from src.core.log_sink import JSONLinesLogSink
+from src.core.query_instrumentation import QueryInstrumentation
+from src.db.pool import InstrumentedAsyncAdaptedQueuePool
+from src.db.read_your_writes import current_write_tracker
+from src.db.unit_of_work import UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+
+# Fraction of its timeout a transaction's statement_timeout may outlive the
+# request deadline by before it's set again, which costs a round trip
+STATEMENT_TIMEOUT_SLACK = 0.1
+
+
+class DeadlineSession(Session):
+    """
+    Session whose transactions run with `statement_timeout` set to the time
+    left until the deadline of the current request, if there is one.
+
+    The timeout is set when the transaction begins and set again to what's
+    left before a later statement once more than `STATEMENT_TIMEOUT_SLACK`
+    of it has passed, so the statements of a transaction together can't
+    outlive the deadline by more than that fraction of the budget.
+    """
+
+
+@sa.event.listens_for(DeadlineSession, "after_begin")
+def _set_statement_timeout(
+    session: Session, transaction: SessionTransaction, connection: sa.Connection
+) -> None:
+    # A client that disconnects from now on cancels the queries of its request
+    watch_disconnect()
+
+    deadline = current_deadline.get()
+    if deadline is None:
+        return
+
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+
+    if connection.dialect.name != "postgresql":
+        return
+
+    # set_config(..., true) is SET LOCAL, bound as a parameter so that it's
+    # one prepared statement whatever the value
+    connection.execute(
+        sa.select(
+            sa.func.set_config(
+                "statement_timeout", str(max(int(remaining * 1000), 1)), True
+            )
+        )
+    )
+    connection.info["statement_timeout"] = (deadline, remaining, time.monotonic())
+
+
+def _refresh_statement_timeout(
+    connection: sa.Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    """
+    before_cursor_execute hook setting the timeout of `_set_statement_timeout`
+    again once the deadline has run down too far below it.
+    """
+    applied = connection.info.get("statement_timeout")
+    if applied is None:
+        return
+
+    applied_deadline, timeout, applied_at = applied
+    deadline = current_deadline.get()
+    # Set by an earlier request that used the pooled connection
+    if deadline is None or deadline is not applied_deadline:
+        return
+
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+
+    # The statement could run this much past the deadline
+    if time.monotonic() - applied_at <= timeout * STATEMENT_TIMEOUT_SLACK:
+        return
+
+    # A cursor of its own, so the statement's one and its events are untouched
+    placeholder = "$1" if connection.dialect.paramstyle == "numeric_dollar" else "%s"
+    refresh_cursor = connection.connection.cursor()
+    try:
+        refresh_cursor.execute(
+            f"SELECT set_config('statement_timeout', {placeholder}, true)",
+            (str(max(int(remaining * 1000), 1)),),
+        )
+    finally:
+        refresh_cursor.close()
+    connection.info["statement_timeout"] = (deadline, remaining, time.monotonic())
+
+
+class ReplicaSession(DeadlineSession):
+    """
+    Session of a read replica (`info["replica"]`). A statement that fails
+    because the replica is unreachable marks it unhealthy and is retried
+    once on the primary, where the session stays from then on.
+    """
+
+    # The one method execute, scalar and scalars all go through
+    def _execute_internal(self: Self, *args: Any, **kwargs: Any) -> Any:
+        replica: ReadReplica | None = self.info.get("replica")
+        try:
+            return super()._execute_internal(*args, **kwargs)
+        except (DBAPIError, OSError) as e:
+            if replica is None or self.bind is replica.fallback:
+                raise
+            # Failed connects raise OSError without reaching handle_error
+            if isinstance(e, OSError) or e.connection_invalidated:
+                replica.mark_unhealthy()
+            if not replica.unhealthy:
+                raise
+
+        self.rollback()
+        self.bind = replica.fallback
+        return super()._execute_internal(*args, **kwargs)
+
+
+class ReadReplica:
+    def __init__(
+        self: Self, engine: AsyncEngine, fallback: sa.Engine, retry_interval: float
+    ) -> None:
+        self.engine = engine
+        # The primary, which reads fall back to while the replica is down
+        self.fallback = fallback
+        self.retry_interval = retry_interval
+        self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+            bind=engine,
+            sync_session_class=ReplicaSession,
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+            info={"replica": self},
+        )
+        self.unhealthy_until: float = 0.0
+
+    @property
+    def checked_out(self: Self) -> int:
+        checked_out: int = getattr(self.engine.pool, "checkedout", lambda: 0)()
+        return checked_out
+
+    @property
+    def unhealthy(self: Self) -> bool:
+        return self.unhealthy_until > time.monotonic()
+
+    def mark_unhealthy(self: Self) -> None:
+        self.unhealthy_until = time.monotonic() + self.retry_interval
 
 
 class DataBaseService:
@@ -18,30 +188,218 @@ class DataBaseService:
         echo_pool: bool = False,
         pool_size: int = 5,
         max_overflow: int = 10,
+        prepared_statement_cache_size: int = 100,
+        statement_cache_size: int = 100,
+        query_cache_size: int = 500,
+        pgbouncer: bool = False,
+        replica_urls: list[str] | None = None,
+        replica_selection: Literal["round_robin", "least_busy"] = "round_robin",
+        replica_retry_interval: float = 30.0,
+        read_your_writes_window: float = 0.0,
+        query_instrumentation: QueryInstrumentation | None = None,
     ) -> None:
-        self.engine: AsyncEngine = create_async_engine(
-            url=url,
-            echo=echo,
-            echo_pool=echo_pool,
-            pool_size=pool_size,
-            max_overflow=max_overflow,
-        )
-        self.async_session_factory: async_sessionmaker[AsyncSession] = (
-            async_sessionmaker(
-                bind=self.engine,
-                autoflush=False,
-                autocommit=False,
-                expire_on_commit=False,
+        self.url = url
+        self.replica_urls = replica_urls or []
+        self.pool_size = pool_size
+        connect_args: dict[str, Any] = {
+            "prepared_statement_cache_size": prepared_statement_cache_size,
+            "statement_cache_size": statement_cache_size,
+        }
+        if pgbouncer:
+            connect_args = {
+                "prepared_statement_cache_size": 0,
+                "statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        self.engine_options: dict[str, Any] = {
+            "echo": echo,
+            "echo_pool": echo_pool,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "poolclass": InstrumentedAsyncAdaptedQueuePool,
+            "query_cache_size": query_cache_size,
+            "connect_args": connect_args,
+        }
+
+        self.replica_selection = replica_selection
+        self.replica_retry_interval = replica_retry_interval
+        self.read_your_writes_window = read_your_writes_window
+        self.query_instrumentation = query_instrumentation
+        self._round_robin = itertools.count()
+
+        self._engine: AsyncEngine | None = None
+        self._async_session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._replicas: list[ReadReplica] = []
+        self._pid: int | None = None
+
+    @property
+    def engine(self: Self) -> AsyncEngine:
+        self._ensure_engines()
+        return cast(AsyncEngine, self._engine)
+
+    @property
+    def async_session_factory(self: Self) -> async_sessionmaker[AsyncSession]:
+        self._ensure_engines()
+        return cast(async_sessionmaker[AsyncSession], self._async_session_factory)
+
+    @property
+    def replicas(self: Self) -> list[ReadReplica]:
+        self._ensure_engines()
+        return self._replicas
+
+    @property
+    def pools(self: Self) -> list[InstrumentedAsyncAdaptedQueuePool]:
+        return [
+            cast(InstrumentedAsyncAdaptedQueuePool, engine.pool)
+            for engine in (self.engine, *(replica.engine for replica in self.replicas))
+        ]
+
+    async def warm_up(self: Self, connections: int) -> None:
+        """
+        Opens up to `connections` (at most `pool_size`) connections of every
+        pool and returns them to it, so the first requests of a worker don't
+        pay for connection setup. Failures are logged, not raised.
+        """
+        count = min(connections, self.pool_size)
+        for engine in (self.engine, *(replica.engine for replica in self.replicas)):
+            results = await asyncio.gather(
+                *(engine.connect().start() for _ in range(count)),
+                return_exceptions=True,
             )
-        )
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.warning(
+                        "Pool warm-up of %s failed: %s",
+                        engine.pool.logging_name,
+                        result,
+                    )
+                else:
+                    await result.close()
 
     async def dispose(self: Self) -> None:
-        await self.engine.dispose()
+        if self._engine is None or self._pid != os.getpid():
+            return
+
+        await self._engine.dispose()
+        for replica in self._replicas:
+            await replica.engine.dispose()
 
     async def get_async_session(self: Self) -> AsyncGenerator[AsyncSession, None]:
         async with self.async_session_factory() as session:
             yield session
 
+    async def get_read_session(self: Self) -> AsyncGenerator[AsyncSession, None]:
+        async with self.read_session_factory() as session:
+            yield session
+
+    def unit_of_work(self: Self) -> UnitOfWork:
+        return UnitOfWork(self.async_session_factory)
+
+    async def get_unit_of_work(self: Self) -> AsyncGenerator[UnitOfWork, None]:
+        """
+        Dependency wrapping the request in one transaction, committed after
+        the endpoint returns and before the response is sent.
+        """
+        async with self.unit_of_work() as unit_of_work:
+            yield unit_of_work
+
+    def read_session_factory(self: Self) -> AsyncSession:
+        """
+        Session for read-only work. Goes to a healthy replica, or to the
+        primary when no replica is configured or healthy, or when the current
+        client committed within the last `read_your_writes_window` seconds
+        (see `ReadYourWritesMiddleware`). A read the replica fails to serve
+        because it went down is retried on the primary.
+        """
+        replica = self._select_replica()
+        if replica is None:
+            return self.async_session_factory()
+
+        return replica.session_factory()
+
+    def _ensure_engines(self: Self) -> None:
+        """
+        Engines are created on first use in every process rather than at
+        import, so that an app preloaded by the gunicorn master never shares
+        pooled connections with its workers.
+        """
+        if self._pid == os.getpid():
+            return
+
+        if self._engine is not None:
+            # Inherited through fork: forget the parent's pooled connections
+            # without closing them, as the parent still owns them
+            self._engine.sync_engine.dispose(close=False)
+            for replica in self._replicas:
+                replica.engine.sync_engine.dispose(close=False)
+
+        self._engine = create_async_engine(
+            url=self.url, pool_logging_name="primary", **self.engine_options
+        )
+        self._async_session_factory = async_sessionmaker(
+            bind=self._engine,
+            sync_session_class=DeadlineSession,
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+        )
+        self._replicas = [
+            ReadReplica(
+                create_async_engine(
+                    url=replica_url,
+                    pool_logging_name=f"replica_{i}",
+                    execution_options={"postgresql_readonly": True},
+                    **self.engine_options,
+                ),
+                fallback=self._engine.sync_engine,
+                retry_interval=self.replica_retry_interval,
+            )
+            for i, replica_url in enumerate(self.replica_urls)
+        ]
+        self._pid = os.getpid()
+
+        if self.query_instrumentation is not None:
+            self.query_instrumentation.instrument(self._engine.sync_engine)
+            for replica in self._replicas:
+                self.query_instrumentation.instrument(replica.engine.sync_engine)
+
+        sa.event.listen(self._engine.sync_engine, "commit", self._on_primary_commit)
+        for engine in (self._engine, *(replica.engine for replica in self._replicas)):
+            sa.event.listen(
+                engine.sync_engine, "before_cursor_execute", _refresh_statement_timeout
+            )
+        for replica in self._replicas:
+            sa.event.listen(
+                replica.engine.sync_engine, "handle_error", self._on_replica_error
+            )
+
+    def _select_replica(self: Self) -> ReadReplica | None:
+        tracker = current_write_tracker.get()
+        if tracker is not None and tracker.within(self.read_your_writes_window):
+            return None
+
+        healthy = [r for r in self.replicas if not r.unhealthy]
+        if not healthy:
+            return None
+
+        if self.replica_selection == "least_busy":
+            return min(healthy, key=lambda r: r.checked_out)
+
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    def _on_primary_commit(self: Self, conn: Any) -> None:
+        tracker = current_write_tracker.get()
+        if tracker is not None:
+            tracker.commit()
+
+    def _on_replica_error(self: Self, context: ExceptionContext) -> None:
+        if not context.is_disconnect and context.connection is not None:
+            return
+
+        for replica in self.replicas:
+            if replica.engine.sync_engine is context.engine:
+                replica.mark_unhealthy()
+
 
 db_service = DataBaseService(
     url=str(settings.db.url),
@@ -49,4 +407,23 @@ db_service = DataBaseService(
     echo_pool=settings.db.echo_pool,
     pool_size=settings.db.pool_size,
     max_overflow=settings.db.max_overflow,
+    prepared_statement_cache_size=settings.db.prepared_statement_cache_size,
+    statement_cache_size=settings.db.statement_cache_size,
+    query_cache_size=settings.db.query_cache_size,
+    pgbouncer=settings.db.pgbouncer,
+    replica_urls=settings.db.replica_urls,
+    replica_selection=settings.db.replica_selection,
+    replica_retry_interval=settings.db.replica_retry_interval,
+    read_your_writes_window=settings.db.read_your_writes_window,
+    query_instrumentation=(
+        QueryInstrumentation(
+            sink=JSONLinesLogSink(
+                "slow_queries", directory=settings.query_log.directory
+            ),
+            slow_query_threshold=settings.query_log.slow_query_threshold,
+            n_plus_one_threshold=settings.query_log.n_plus_one_threshold,
+        )
+        if settings.query_log.enabled
+        else None
+    ),
 )
@@ -0,0 +1,70 @@
+"""
+Helpers for Alembic revisions, e.g. moving an existing table to UUIDv7 keys:
+
+    def upgrade() -> None:
+        create_uuid_generate_v7()
+        set_uuid_v7_server_default("items")
+
+    def downgrade() -> None:
+        drop_uuid_server_default("items")
+        drop_uuid_generate_v7()
+
+Existing keys are left as they are: uuid4 and uuid7 values share the column
+type and the index, only new rows get time-ordered keys.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# RFC 9562 UUIDv7 with random bits taken from gen_random_uuid(), whose bytes
+# 6 and 8 carry the version and variant bits that are overwritten here.
+# PostgreSQL 18 ships uuidv7(), which can be used instead.
+UUID_GENERATE_V7_SQL = """
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+DECLARE
+    uuid_bytes bytea;
+BEGIN
+    uuid_bytes = substring(
+        int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint)
+        FROM 3
+    ) || substring(uuid_send(gen_random_uuid()) FROM 7);
+    uuid_bytes = set_byte(
+        uuid_bytes, 6, (b'0111' || get_byte(uuid_bytes, 6)::bit(4))::bit(8)::int
+    );
+    uuid_bytes = set_byte(
+        uuid_bytes, 8, (b'10' || get_byte(uuid_bytes, 8)::bit(6))::bit(8)::int
+    );
+    RETURN encode(uuid_bytes, 'hex')::uuid;
+END
+$$ LANGUAGE plpgsql VOLATILE
+"""
+
+
+def create_uuid_generate_v7() -> None:
+    op.execute(UUID_GENERATE_V7_SQL)
+
+
+def drop_uuid_generate_v7() -> None:
+    op.execute("DROP FUNCTION IF EXISTS uuid_generate_v7()")
+
+
+def set_uuid_v7_server_default(
+    table_name: str, column_name: str = "id", schema: str | None = None
+) -> None:
+    """
+    Time-ordered keys for rows inserted without an id, e.g. by raw SQL,
+    while the app keeps generating them itself (see UUIDPkMixin).
+    """
+    op.alter_column(
+        table_name,
+        column_name,
+        server_default=sa.text("uuid_generate_v7()"),
+        schema=schema,
+    )
+
+
+def drop_uuid_server_default(
+    table_name: str, column_name: str = "id", schema: str | None = None
+) -> None:
+    op.alter_column(table_name, column_name, server_default=None, schema=schema)
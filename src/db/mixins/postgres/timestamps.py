@@ -6,12 +6,18 @@ from sqlalchemy.dialects.postgresql import TIMESTAMP
 
 
 class CreatedAtMixin:
+    # Indexed so keyset pagination on (created_at, id) doesn't sort the table
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP, server_default=func.now(), nullable=False
+        TIMESTAMP, server_default=func.now(), nullable=False, index=True
     )
 
 
 class UpdatedAtMixin:
+    # Indexed so the max(updated_at) of list ETags is an index lookup
     updated_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False
+        TIMESTAMP,
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        index=True,
     )
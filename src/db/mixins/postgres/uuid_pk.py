@@ -1,10 +1,25 @@
 import uuid
+from typing import Callable
 
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 
 from sqlalchemy.dialects.postgresql import UUID
 
+from src.core.config import settings
+from src.core.utils.uuid7 import uuid7
+
+
+UUID_PK_FACTORIES: dict[str, Callable[[], uuid.UUID]] = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
 
 class UUIDPkMixin:
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Ids generated by the app, see DBConfig.uuid_pk_strategy
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=UUID_PK_FACTORIES[settings.db.uuid_pk_strategy],
+    )
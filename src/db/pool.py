@@ -0,0 +1,45 @@
+import time
+from typing import ClassVar, Protocol, Self
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+from sqlalchemy.pool.base import ConnectionPoolEntry
+
+
+class PoolObserver(Protocol):
+    def checked_out(
+        self: Self, pool: "InstrumentedAsyncAdaptedQueuePool", waited: float
+    ) -> None: ...
+
+    def checked_in(self: Self, pool: "InstrumentedAsyncAdaptedQueuePool") -> None: ...
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that reports every checkout, with the time spent waiting for a
+    connection, and every checkin to the registered observers. Pools are told
+    apart by `pool_logging_name`, which survives `recreate()`.
+    """
+
+    observers: ClassVar[list[PoolObserver]] = []
+
+    @property
+    def name(self: Self) -> str:
+        return self._orig_logging_name or "default"
+
+    @property
+    def capacity(self: Self) -> int:
+        return self.size() + max(self._max_overflow, 0)
+
+    def connect(self: Self) -> PoolProxiedConnection:
+        started_at = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            waited = time.perf_counter() - started_at
+            for observer in self.observers:
+                observer.checked_out(self, waited)
+
+    def _do_return_conn(self: Self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        for observer in self.observers:
+            observer.checked_in(self)
@@ -0,0 +1,31 @@
+import time
+from contextvars import ContextVar
+from typing import Self
+
+
+class WriteTracker:
+    """
+    When the current client last committed to the primary, as wall clock
+    time so that it can be compared across workers and hosts. Set per
+    request by `ReadYourWritesMiddleware` from the client's cookie and
+    updated by the commits the request makes.
+    """
+
+    def __init__(self: Self, last_commit_at: float | None = None) -> None:
+        self.last_commit_at = last_commit_at
+        self.committed = False
+
+    def commit(self: Self) -> None:
+        self.last_commit_at = time.time()
+        self.committed = True
+
+    def within(self: Self, window: float) -> bool:
+        return (
+            self.last_commit_at is not None
+            and time.time() - self.last_commit_at < window
+        )
+
+
+current_write_tracker: ContextVar[WriteTracker | None] = ContextVar(
+    "current_write_tracker", default=None
+)
@@ -0,0 +1,134 @@
+import contextlib
+from contextvars import ContextVar, Token
+from types import TracebackType
+from typing import AsyncIterator, Callable, Self
+
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
+
+
+class UnitOfWork:
+    """
+    One transaction shared by every repository call made inside
+    `async with UnitOfWork(...)`. Repositories join it instead of committing
+    (see `transaction`), and it commits once on exit or rolls back if the
+    block raised.
+
+    A unit of work opened inside another one runs in a savepoint of the outer
+    transaction, so its block can fail without failing the outer one.
+    Callbacks registered with `on_commit` run after the outermost commit and
+    are dropped on rollback.
+
+    The session is shared, so repository calls must not run concurrently
+    (e.g. with `asyncio.gather`) inside a unit of work.
+    """
+
+    def __init__(self: Self, session_factory: Callable[[], AsyncSession]) -> None:
+        self.session_factory = session_factory
+        self._session: AsyncSession | None = None
+        self._parent: UnitOfWork | None = None
+        self._savepoint: AsyncSessionTransaction | None = None
+        self._on_commit: list[Callable[[], None]] = []
+        self._token: Token[UnitOfWork | None] | None = None
+
+    @property
+    def session(self: Self) -> AsyncSession:
+        if self._session is None:
+            raise RuntimeError("The unit of work is not active")
+
+        return self._session
+
+    def on_commit(self: Self, callback: Callable[[], None]) -> None:
+        self._on_commit.append(callback)
+
+    async def __aenter__(self: Self) -> Self:
+        self._parent = current_unit_of_work.get()
+        if self._parent is not None:
+            self._session = self._parent.session
+            self._savepoint = await self._session.begin_nested()
+        else:
+            self._session = self.session_factory()
+
+        self._token = current_unit_of_work.set(self)
+        return self
+
+    async def __aexit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._token is not None:
+            current_unit_of_work.reset(self._token)
+            self._token = None
+
+        session, self._session = self.session, None
+        callbacks, self._on_commit = self._on_commit, []
+
+        if self._savepoint is not None:
+            savepoint, self._savepoint = self._savepoint, None
+            if exc_type is not None:
+                await savepoint.rollback()
+            else:
+                await savepoint.commit()
+                # Run once the outermost transaction commits
+                for callback in callbacks:
+                    self._parent.on_commit(callback)  # type: ignore[union-attr]
+            return
+
+        try:
+            if exc_type is None:
+                await session.commit()
+        finally:
+            await session.close()
+
+        if exc_type is None:
+            for callback in callbacks:
+                callback()
+
+
+current_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar(
+    "current_unit_of_work", default=None
+)
+
+
+@contextlib.asynccontextmanager
+async def transaction(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    The session of the active unit of work, or `session` committed when the
+    block succeeds and closed afterwards.
+    """
+    unit_of_work = current_unit_of_work.get()
+    if unit_of_work is not None:
+        yield unit_of_work.session
+        return
+
+    async with session:
+        yield session
+        await session.commit()
+
+
+@contextlib.asynccontextmanager
+async def session_scope(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    The session of the active unit of work, so reads see its uncommitted
+    writes, or `session` closed afterwards.
+    """
+    unit_of_work = current_unit_of_work.get()
+    if unit_of_work is not None:
+        yield unit_of_work.session
+        return
+
+    async with session:
+        yield session
+
+
+def on_commit(callback: Callable[[], None]) -> None:
+    """
+    Runs `callback` after the active unit of work commits, or right away
+    outside of one.
+    """
+    unit_of_work = current_unit_of_work.get()
+    if unit_of_work is not None:
+        unit_of_work.on_commit(callback)
+    else:
+        callback()
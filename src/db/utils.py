@@ -0,0 +1,11 @@
+import sqlalchemy as sa
+from sqlalchemy.engine import Dialect
+
+
+def quote_table_name(table: sa.Table, dialect: Dialect) -> str:
+    preparer = dialect.identifier_preparer
+    name = preparer.quote(table.name)
+    if table.schema is not None:
+        return f"{preparer.quote_schema(table.schema)}.{name}"
+
+    return name
@@ -2,7 +2,19 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.config import settings
-from src.core.middlewares import RequestsLogMiddleware
+from src.core.log_sink import JSONLinesLogSink
+from src.core.load_shedding import AdaptiveConcurrencyLimiter
+from src.core.middlewares import (
+    DeadlineMiddleware,
+    LoadSheddingMiddleware,
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    ReadYourWritesMiddleware,
+    RequestTrackerMiddleware,
+    RequestsLogMiddleware,
+)
+from src.db.db_service import db_service
+from src.db.pool import InstrumentedAsyncAdaptedQueuePool
 
 
 def apply_middlewares(app: FastAPI) -> FastAPI:
@@ -15,6 +27,71 @@ def apply_middlewares(app: FastAPI) -> FastAPI:
     )
 
     if settings.fastapi.log_requests:
-        app.add_middleware(RequestsLogMiddleware)
+        app.add_middleware(
+            RequestsLogMiddleware,
+            sink=JSONLinesLogSink(
+                "requests",
+                directory=settings.requests_log.directory,
+                max_bytes=settings.requests_log.max_bytes,
+                backup_count=settings.requests_log.backup_count,
+                batch_size=settings.requests_log.batch_size,
+            ),
+            body_max_size=settings.requests_log.body_max_size,
+            skip_body_paths=settings.requests_log.skip_body_paths,
+        )
+
+    if db_service.query_instrumentation is not None:
+        app.add_middleware(
+            QueryStatsMiddleware,
+            instrumentation=db_service.query_instrumentation,
+            debug_headers=settings.query_log.debug_headers,
+        )
+
+    if settings.db.read_your_writes_window > 0 and db_service.replica_urls:
+        app.add_middleware(
+            ReadYourWritesMiddleware,
+            window=settings.db.read_your_writes_window,
+            cookie=settings.db.read_your_writes_cookie,
+        )
+
+    if settings.metrics.enabled:
+        app.add_middleware(MetricsMiddleware)
+
+    if settings.deadline.enabled:
+        app.add_middleware(
+            DeadlineMiddleware,
+            default_timeout=settings.deadline.default_timeout,
+            max_timeout=settings.deadline.max_timeout,
+            header=settings.deadline.header,
+        )
+
+    if settings.load_shedding.enabled:
+        limiter = AdaptiveConcurrencyLimiter(
+            app.state.request_tracker,
+            initial_limit=settings.load_shedding.initial_limit,
+            min_limit=settings.load_shedding.min_limit,
+            max_limit=settings.load_shedding.max_limit,
+            target_wait=settings.load_shedding.target_checkout_wait,
+            backoff=settings.load_shedding.backoff,
+            cooldown=settings.load_shedding.cooldown,
+        )
+        # Replaces the limiter of an app created before in this process
+        observers = InstrumentedAsyncAdaptedQueuePool.observers
+        observers[:] = [
+            observer
+            for observer in observers
+            if not isinstance(observer, AdaptiveConcurrencyLimiter)
+        ]
+        observers.append(limiter)
+        # Shed requests skip all the middlewares below
+        app.add_middleware(
+            LoadSheddingMiddleware,
+            limiter=limiter,
+            retry_after=settings.load_shedding.retry_after,
+            exempt_paths=settings.load_shedding.exempt_paths,
+        )
+
+    # Outermost, so that shutdown waits for everything the app is doing
+    app.add_middleware(RequestTrackerMiddleware, tracker=app.state.request_tracker)
 
     return app
@@ -0,0 +1,51 @@
+import unittest
+from typing import Self
+
+from src.core.repositories.cache import LRUTTLCache
+
+
+class LRUTTLCacheTests(unittest.TestCase):
+    def test_set_after_invalidation_during_read_is_dropped(self: Self) -> None:
+        cache: LRUTTLCache[str, int] = LRUTTLCache()
+        generation = cache.generation()
+        cache.invalidate("a")
+        cache.set("a", 1, generation)
+
+        self.assertIsNone(cache.get("a"))
+
+    def test_set_of_other_keys_is_kept(self: Self) -> None:
+        cache: LRUTTLCache[str, int] = LRUTTLCache()
+        generation = cache.generation()
+        cache.invalidate("a")
+        cache.set_many([("a", 1), ("b", 2)], generation)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+    def test_read_started_after_invalidation_is_stored(self: Self) -> None:
+        cache: LRUTTLCache[str, int] = LRUTTLCache()
+        cache.invalidate("a")
+        cache.set("a", 1, cache.generation())
+
+        self.assertEqual(cache.get("a"), 1)
+
+    def test_forgotten_invalidations_stay_conservative(self: Self) -> None:
+        cache: LRUTTLCache[str, int] = LRUTTLCache(maxsize=2)
+        generation = cache.generation()
+        cache.invalidate_many(["a", "b", "c"])
+        cache.set("a", 1, generation)
+
+        self.assertIsNone(cache.get("a"))
+
+    def test_set_within_settle_window_is_dropped(self: Self) -> None:
+        cache: LRUTTLCache[str, int] = LRUTTLCache()
+        cache.invalidate("a")
+        cache.set("a", 1, cache.generation(), settle=60.0)
+        self.assertIsNone(cache.get("a"))
+
+        cache.set("a", 1, cache.generation(), settle=0.0)
+        self.assertEqual(cache.get("a"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
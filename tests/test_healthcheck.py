@@ -0,0 +1,46 @@
+import asyncio
+import unittest
+from typing import Self
+
+from src.apps.v1.healthcheck.schemas import ServiceHealthcheckResponseSchema
+from src.apps.v1.healthcheck.use_cases import HealthCheckUseCaseImpl
+
+
+class CountingService:
+    name = "counting"
+
+    def __init__(self: Self) -> None:
+        self.calls = 0
+
+    async def execute(self: Self) -> ServiceHealthcheckResponseSchema:
+        self.calls += 1
+        return ServiceHealthcheckResponseSchema(
+            name=self.name, status="OK", response_time=0.0
+        )
+
+
+class HealthCheckUseCaseTests(unittest.IsolatedAsyncioTestCase):
+    async def test_first_check_runs_the_checks_once(self: Self) -> None:
+        service = CountingService()
+        use_case = HealthCheckUseCaseImpl(service, refresh_interval=0.05)
+
+        await use_case.check()
+        await asyncio.sleep(0.01)
+        self.assertEqual(service.calls, 1)
+
+        await asyncio.sleep(0.06)
+        self.assertEqual(service.calls, 2)
+        await use_case.close()
+
+    async def test_checks_within_the_ttl_are_answered_from_the_cache(
+        self: Self,
+    ) -> None:
+        service = CountingService()
+        use_case = HealthCheckUseCaseImpl(service, refresh_interval=60.0)
+
+        first = await use_case.check()
+        second = await use_case.check()
+
+        self.assertIs(first, second)
+        self.assertEqual(service.calls, 1)
+        await use_case.close()
@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+from typing import Any, Self
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel
+
+from src.core.repositories.loader import RepositoryLoader
+
+
+class ItemSchema(BaseModel):
+    id: UUID
+    name: str
+
+
+class StubRepository:
+    """
+    `get_by_ids` that blocks until `release` is set, so a batch can be kept
+    in flight.
+    """
+
+    model_type = ItemSchema
+
+    def __init__(self: Self, items: list[ItemSchema]) -> None:
+        self.items = {item.id: item for item in items}
+        self.release = asyncio.Event()
+        self.started = asyncio.Event()
+        self.calls: list[list[UUID]] = []
+
+    async def get_by_ids(self: Self, ids: list[UUID]) -> list[ItemSchema]:
+        self.calls.append(ids)
+        self.started.set()
+        await self.release.wait()
+        return [self.items[id] for id in ids if id in self.items]
+
+
+def make_loader(
+    items: list[ItemSchema],
+) -> tuple[RepositoryLoader[Any], StubRepository]:
+    repository = StubRepository(items)
+    return RepositoryLoader(repository), repository  # type: ignore[arg-type]
+
+
+class RepositoryLoaderTests(unittest.IsolatedAsyncioTestCase):
+    async def test_clear_during_batch_resolves_waiting_callers(self: Self) -> None:
+        item = ItemSchema(id=uuid4(), name="item")
+        loader, repository = make_loader([item])
+
+        waiting = asyncio.ensure_future(loader.get(item.id))
+        await repository.started.wait()
+        loader.clear()
+        repository.release.set()
+
+        self.assertEqual(await asyncio.wait_for(waiting, 1), item)
+
+    async def test_clear_before_dispatch_resolves_queued_callers(self: Self) -> None:
+        item = ItemSchema(id=uuid4(), name="item")
+        loader, repository = make_loader([item])
+        repository.release.set()
+
+        waiting = loader.get_or_none(item.id)
+        loader.clear(item.id)
+
+        self.assertEqual(await asyncio.wait_for(waiting, 1), item)
+
+    async def test_prime_during_batch_resolves_waiting_callers(self: Self) -> None:
+        item = ItemSchema(id=uuid4(), name="item")
+        primed = ItemSchema(id=item.id, name="primed")
+        loader, repository = make_loader([item])
+
+        waiting = asyncio.ensure_future(loader.get(item.id))
+        await repository.started.wait()
+        loader.prime(primed)
+        repository.release.set()
+
+        self.assertEqual(await asyncio.wait_for(waiting, 1), item)
+        # Later loads see the primed item
+        self.assertEqual(await loader.get(item.id), primed)
+        self.assertEqual(len(repository.calls), 1)
+
+    async def test_failed_batch_is_retried(self: Self) -> None:
+        item = ItemSchema(id=uuid4(), name="item")
+        loader, repository = make_loader([item])
+
+        async def failing_get_by_ids(ids: list[UUID]) -> list[ItemSchema]:
+            raise RuntimeError("boom")
+
+        repository.get_by_ids = failing_get_by_ids  # type: ignore[method-assign]
+        with self.assertRaises(RuntimeError):
+            await loader.get(item.id)
+
+        del repository.get_by_ids
+        repository.release.set()
+        self.assertEqual(await loader.get(item.id), item)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import unittest
+from typing import Any, Self
+from uuid import UUID, uuid4
+
+from fastapi import APIRouter, FastAPI
+from pydantic import BaseModel
+
+from src.core.repositories.sqla.projection import is_projection_of, partial_schema
+from src.core.routing import PydanticJSONRoute
+from src.core.schemas import PaginatedResponseSchema
+
+
+class ReadSchema(BaseModel):
+    id: UUID
+    name: str
+    size: int
+
+
+PartialReadSchema = partial_schema(ReadSchema, frozenset({"name"}))
+
+
+def page(item: BaseModel) -> PaginatedResponseSchema[Any]:
+    return PaginatedResponseSchema[type(item)](  # type: ignore[misc]
+        page=1, page_size=1, total_pages=1, total_items=1, items=[item]
+    )
+
+
+async def get(app: FastAPI, path: str) -> tuple[int, Any]:
+    messages: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b""}
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "scheme": "http",
+        "server": ("test", 80),
+        "http_version": "1.1",
+    }
+    await app(scope, receive, send)
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return messages[0]["status"], json.loads(body)
+
+
+class PartialResponseTests(unittest.TestCase):
+    def test_partial_schemas_are_projections_of_their_schema(self: Self) -> None:
+        self.assertTrue(is_projection_of(PartialReadSchema, ReadSchema))
+        self.assertTrue(
+            is_projection_of(
+                PaginatedResponseSchema[PartialReadSchema],  # type: ignore[valid-type]
+                PaginatedResponseSchema[ReadSchema],
+            )
+        )
+
+    def test_other_models_are_not_projections(self: Self) -> None:
+        self.assertFalse(is_projection_of(ReadSchema, PartialReadSchema))
+        self.assertFalse(
+            is_projection_of(PaginatedResponseSchema[ReadSchema], ReadSchema)
+        )
+
+    def test_partial_reads_are_sent_without_unselected_fields(self: Self) -> None:
+        router = APIRouter(route_class=PydanticJSONRoute)
+
+        @router.get("/item", response_model=ReadSchema)
+        async def item() -> Any:
+            return PartialReadSchema(name="a")
+
+        @router.get("/items", response_model=PaginatedResponseSchema[ReadSchema])
+        async def items() -> Any:
+            return page(PartialReadSchema(name="a"))
+
+        app = FastAPI()
+        app.include_router(router)
+
+        self.assertEqual(asyncio.run(get(app, "/item")), (200, {"name": "a"}))
+        status, body = asyncio.run(get(app, "/items"))
+        self.assertEqual(status, 200)
+        self.assertEqual(body["items"], [{"name": "a"}])
+
+    def test_full_reads_are_sent_whole(self: Self) -> None:
+        router = APIRouter(route_class=PydanticJSONRoute)
+        id = uuid4()
+
+        @router.get("/item", response_model=ReadSchema)
+        async def item() -> Any:
+            return ReadSchema(id=id, name="a", size=1)
+
+        app = FastAPI()
+        app.include_router(router)
+
+        self.assertEqual(
+            asyncio.run(get(app, "/item")),
+            (200, {"id": str(id), "name": "a", "size": 1}),
+        )
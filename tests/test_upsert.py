@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+from typing import Any, Self, cast
+
+import sqlalchemy as sa
+from pydantic import BaseModel
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.repositories.exceptions import InvalidConflictColumnsError
+from src.core.repositories.sqla.base_repository import BaseSQLAlchemyRepositoryImpl
+from src.db.base import Base
+
+
+class Sku(Base):
+    __tablename__ = "test_upsert_skus"
+
+    code: Mapped[str] = mapped_column(sa.String(32), unique=True)
+    name: Mapped[str] = mapped_column(sa.String(64))
+
+
+class SkuCreateSchema(BaseModel):
+    code: str
+    name: str
+
+
+class SkuRepository(BaseSQLAlchemyRepositoryImpl[Sku, Any, SkuCreateSchema, Any]):
+    model_type = Sku
+
+
+def make_repository() -> SkuRepository:
+    # Conflict targets are checked before the session is used
+    return SkuRepository(cast(Any, None))
+
+
+class ConflictColumnsTests(unittest.TestCase):
+    def test_defaults_to_the_natural_key(self: Self) -> None:
+        repository = make_repository()
+
+        self.assertEqual(
+            repository._conflict_columns(["code", "name"], None), ("code",)
+        )
+
+    def test_defaults_to_the_primary_key_when_rows_give_it_alone(self: Self) -> None:
+        repository = make_repository()
+
+        self.assertEqual(repository._conflict_columns(["id", "name"], None), ("id",))
+
+    def test_conflict_columns_the_rows_do_not_give_are_rejected(self: Self) -> None:
+        repository = make_repository()
+        rows = [SkuCreateSchema(code="a", name="A")]
+
+        with self.assertRaises(InvalidConflictColumnsError):
+            asyncio.run(repository.bulk_upsert(rows, conflict_columns=("id",)))
+
+    def test_conflict_columns_that_are_not_a_unique_key_are_rejected(
+        self: Self,
+    ) -> None:
+        repository = make_repository()
+        rows = [SkuCreateSchema(code="a", name="A")]
+
+        with self.assertRaises(InvalidConflictColumnsError):
+            asyncio.run(repository.bulk_upsert(rows, conflict_columns=("name",)))
+
+    def test_rows_without_a_unique_key_are_rejected(self: Self) -> None:
+        repository = make_repository()
+
+        with self.assertRaises(InvalidConflictColumnsError):
+            repository._conflict_columns(["name"], None)